@@ -6,6 +6,7 @@ Contains scripts for data analysis and visualization:
 
 - quick_data_analysis.py: Rainfall vs yield correlation analysis
 - exploratory_data_analysis.py: Comprehensive data exploration
+- parquet_cache.py: Shared Parquet cache for the analysis datasets
 """
 
 __version__ = "1.0.0"
@@ -4,9 +4,11 @@ Analyze ISRIC Soil Data to understand data availability and gaps
 """
 
 import polars as pl
-import numpy as np
 from pathlib import Path
 
+PLACEHOLDER_VALUE = -9999.0
+NUMERIC_DTYPES = (pl.Float64, pl.Float32, pl.Int64, pl.Int32)
+
 def analyze_isric_data():
     """Analyze the ISRIC soil properties data"""
     print("🔍 Analyzing ISRIC Soil Properties Data")
@@ -19,19 +21,56 @@ def analyze_isric_data():
         print(f"❌ ISRIC data not found: {isric_path}")
         return
     
-    df = pl.read_csv(isric_path)
-    
-    print(f"📊 Dataset Shape: {df.shape}")
-    print(f"📋 Columns: {len(df.columns)}")
-    print(f"📍 Sample Locations: {len(df)}")
+    lf = pl.scan_csv(isric_path)
+    schema = lf.collect_schema()
+    columns = schema.names()
+    n_cols = len(columns)
+    numeric_cols = [col for col, dtype in schema.items() if dtype in NUMERIC_DTYPES]
+    # Compare integer columns against an integer sentinel so they are not cast to float
+    placeholders = {
+        col: int(PLACEHOLDER_VALUE) if schema[col].is_integer() else PLACEHOLDER_VALUE
+        for col in numeric_cols
+    }
+    
+    # Build every aggregate lazily so the CSV is scanned once by collect_all
+    valid = pl.col("Latitude").is_not_null() & pl.col("Longitude").is_not_null()
+    queries = {
+        "nulls": lf.select([pl.len().alias("__rows"), pl.all().null_count()]),
+        "coords": lf.select([
+            valid.sum().alias("valid_pairs"),
+            pl.col("Latitude").filter(valid).min().alias("lat_min"),
+            pl.col("Latitude").filter(valid).max().alias("lat_max"),
+            pl.col("Longitude").filter(valid).min().alias("lon_min"),
+            pl.col("Longitude").filter(valid).max().alias("lon_max"),
+        ]),
+    }
+    if numeric_cols:
+        # Placeholder counts for every numeric column as one fused select
+        queries["placeholders"] = lf.select([
+            (pl.col(col) == placeholder).sum().alias(col)
+            for col, placeholder in placeholders.items()
+        ])
+    if 'Year' in columns:
+        queries["years"] = lf.filter(pl.col("Year").is_not_null()).select(pl.col("Year").unique().sort())
+    
+    results = dict(zip(queries, pl.collect_all(queries.values())))
+    null_counts = results["nulls"].row(0, named=True)
+    # Row count is computed by pl.len() in the same pass as the null counts
+    n_rows = null_counts.pop("__rows")
+    coords = results["coords"].row(0, named=True)
+    placeholder_counts = results["placeholders"].row(0, named=True) if numeric_cols else {}
+    
+    print(f"📊 Dataset Shape: {(n_rows, n_cols)}")
+    print(f"📋 Columns: {n_cols}")
+    print(f"📍 Sample Locations: {n_rows}")
     
     print("\n🔬 Column Analysis:")
     print("-" * 30)
     
     # Analyze each column
-    for col in df.columns:
-        missing_count = df.select(pl.col(col).null_count()).item()
-        missing_pct = (missing_count / len(df)) * 100
+    for col in columns:
+        missing_count = null_counts[col]
+        missing_pct = (missing_count / n_rows) * 100
         
         if missing_count > 0:
             print(f"❌ {col}: {missing_count} missing ({missing_pct:.1f}%)")
@@ -42,23 +81,18 @@ def analyze_isric_data():
     print("-" * 40)
     
     # Check coordinate coverage
-    lat_missing = df.select(pl.col("Latitude").null_count()).item()
-    lon_missing = df.select(pl.col("Longitude").null_count()).item()
+    lat_missing = null_counts["Latitude"]
+    lon_missing = null_counts["Longitude"]
     
-    print(f"Latitude missing: {lat_missing} ({lat_missing/len(df)*100:.1f}%)")
-    print(f"Longitude missing: {lon_missing} ({lon_missing/len(df)*100:.1f}%)")
+    print(f"Latitude missing: {lat_missing} ({lat_missing/n_rows*100:.1f}%)")
+    print(f"Longitude missing: {lon_missing} ({lon_missing/n_rows*100:.1f}%)")
     
     # Check for valid coordinates
-    valid_coords = df.filter(
-        (pl.col("Latitude").is_not_null()) & 
-        (pl.col("Longitude").is_not_null())
-    )
-    
-    print(f"Valid coordinate pairs: {len(valid_coords)}")
+    print(f"Valid coordinate pairs: {coords['valid_pairs']}")
     
-    if len(valid_coords) > 0:
-        print(f"Latitude range: {valid_coords['Latitude'].min():.3f} to {valid_coords['Latitude'].max():.3f}")
-        print(f"Longitude range: {valid_coords['Longitude'].min():.3f} to {valid_coords['Longitude'].max():.3f}")
+    if coords['valid_pairs'] > 0:
+        print(f"Latitude range: {coords['lat_min']:.3f} to {coords['lat_max']:.3f}")
+        print(f"Longitude range: {coords['lon_min']:.3f} to {coords['lon_max']:.3f}")
     
     print("\n🧪 Soil Properties Analysis:")
     print("-" * 30)
@@ -70,9 +104,9 @@ def analyze_isric_data():
     ]
     
     for prop in soil_properties:
-        if prop in df.columns:
-            missing = df.select(pl.col(prop).null_count()).item()
-            missing_pct = (missing / len(df)) * 100
+        if prop in columns:
+            missing = null_counts[prop]
+            missing_pct = (missing / n_rows) * 100
             
             if missing > 0:
                 print(f"❌ {prop}: {missing} missing ({missing_pct:.1f}%)")
@@ -84,13 +118,13 @@ def analyze_isric_data():
     print("\n📅 Temporal Coverage:")
     print("-" * 25)
     
-    if 'Year' in df.columns:
-        year_missing = df.select(pl.col("Year").null_count()).item()
-        print(f"Year missing: {year_missing} ({year_missing/len(df)*100:.1f}%)")
+    if 'Year' in columns:
+        year_missing = null_counts["Year"]
+        print(f"Year missing: {year_missing} ({year_missing/n_rows*100:.1f}%)")
         
-        if year_missing < len(df):
-            years = df.filter(pl.col("Year").is_not_null())['Year'].unique()
-            print(f"Available years: {sorted(years)}")
+        if year_missing < n_rows:
+            years = results["years"]['Year'].to_list()
+            print(f"Available years: {years}")
     else:
         print("Year column not found")
     
@@ -101,21 +135,16 @@ def analyze_isric_data():
     print("Checking for placeholder values...")
     
     # Check for -9999 values in numeric columns
-    for col in df.columns:
-        if df[col].dtype in [pl.Float64, pl.Float32, pl.Int64, pl.Int32]:
-            try:
-                minus_9999_count = df.filter(pl.col(col) == -9999.0).height
-                if minus_9999_count > 0:
-                    print(f"⚠️  {col}: {minus_9999_count} placeholder values (-9999.0)")
-            except:
-                pass
+    for col, placeholder_count in placeholder_counts.items():
+        if placeholder_count > 0:
+            print(f"⚠️  {col}: {placeholder_count} placeholder values ({PLACEHOLDER_VALUE})")
     
     print("\n💡 Recommendations:")
     print("-" * 20)
     
     # Generate recommendations based on findings
-    total_missing = sum(df.select(pl.col(col).null_count()).item() for col in df.columns)
-    total_cells = len(df) * len(df.columns)
+    total_missing = sum(null_counts.values())
+    total_cells = n_rows * n_cols
     overall_completeness = ((total_cells - total_missing) / total_cells) * 100
     
     print(f"Overall data completeness: {overall_completeness:.1f}%")
@@ -132,7 +161,7 @@ def analyze_isric_data():
     else:
         print("🟢 Data quality is excellent")
     
-    return df
+    return lf
 
 if __name__ == "__main__":
     analyze_isric_data()
@@ -5,59 +5,90 @@ Analyzes missing data patterns across all datasets and compares with master data
 """
 
 import polars as pl
-import pandas as pd
-import numpy as np
 from pathlib import Path
 import json
 from datetime import datetime
 
-def analyze_dataset_completeness(file_path, dataset_name):
-    """Analyze completeness of a single dataset"""
+# orjson writes the report much faster than the stdlib encoder
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Failures expected when a dataset file is missing, malformed or empty
+DATASET_READ_ERRORS = (
+    FileNotFoundError,
+    ZeroDivisionError,
+    pl.exceptions.ComputeError,
+    pl.exceptions.SchemaError,
+    pl.exceptions.NoDataError,
+)
+
+def collect_streaming(query):
+    """Collect a lazy query with the streaming engine, falling back to in-memory"""
     try:
-        if file_path.endswith('.csv'):
-            df = pl.read_csv(file_path)
-        else:
-            print(f"Skipping {file_path} - not a CSV file")
-            return None
-        
-        total_rows = len(df)
-        total_cols = len(df.columns)
-        
-        # Count missing values per column
-        missing_counts = []
-        for col in df.columns:
-            missing_count = df.select(pl.col(col).null_count()).item()
-            missing_counts.append(missing_count)
-        
-        missing_percentages = [(count / total_rows) * 100 for count in missing_counts]
-        
-        # Create completeness summary
-        completeness_data = {
-            'dataset_name': dataset_name,
-            'file_path': str(file_path),
-            'total_rows': total_rows,
-            'total_columns': total_cols,
-            'overall_completeness': ((total_rows * total_cols - sum(missing_counts)) / (total_rows * total_cols)) * 100,
-            'columns': {}
-        }
-        
-        # Analyze each column
-        for i, col in enumerate(df.columns):
-            missing_count = missing_counts[i]
-            missing_pct = missing_percentages[i]
-            
-            completeness_data['columns'][col] = {
+        return query.collect(engine="streaming")
+    except (pl.exceptions.PolarsError, ValueError):
+        return query.collect()
+
+def completeness_query(lf):
+    """Lazy query returning the row count and per-column null counts as one row"""
+    return lf.select([pl.len().alias('__rows'), pl.all().null_count()])
+
+def summarize_completeness(stats, schema, file_path, dataset_name):
+    """Build the completeness summary from a collected completeness_query row"""
+    total_rows, *missing_counts = stats.row(0)
+    total_cols = len(schema)
+    dtypes = schema.dtypes()
+    
+    missing_percentages = [(count / total_rows) * 100 for count in missing_counts]
+    total_missing = sum(missing_counts)
+    total_cells = total_rows * total_cols
+    
+    # Create completeness summary
+    completeness_data = {
+        'dataset_name': dataset_name,
+        'file_path': str(file_path),
+        'total_rows': total_rows,
+        'total_columns': total_cols,
+        'overall_completeness': ((total_cells - total_missing) / total_cells) * 100,
+        'columns': {
+            col: {
                 'missing_count': int(missing_count),
                 'missing_percentage': round(missing_pct, 2),
                 'completeness': round(100 - missing_pct, 2),
-                'data_type': str(df[col].dtype)
+                'data_type': str(dtype)
             }
+            for col, missing_count, missing_pct, dtype in zip(
+                schema.names(), missing_counts, missing_percentages, dtypes
+            )
+        }
+    }
+    
+    return completeness_data
+
+def analyze_dataset_completeness(file_path, dataset_name):
+    """Analyze completeness of a single CSV dataset
+    
+    Returns the completeness summary together with the dataset's LazyFrame
+    so callers can run further queries without re-declaring the scan.
+    """
+    try:
+        lf = pl.scan_csv(file_path)
         
-        return completeness_data
+        # Row count and missing values per column from one streamed query,
+        # keeping memory bounded regardless of file size
+        stats = collect_streaming(completeness_query(lf))
+        completeness_data = summarize_completeness(
+            stats, lf.collect_schema(), file_path, dataset_name
+        )
         
-    except Exception as e:
+        return completeness_data, lf
+        
+    except DATASET_READ_ERRORS as e:
         print(f"Error analyzing {file_path}: {e}")
-        return None
+        return None, None
 
 def analyze_master_dataset():
     """Analyze the master integrated dataset"""
@@ -65,10 +96,10 @@ def analyze_master_dataset():
     
     if not Path(master_path).exists():
         print(f"Master dataset not found: {master_path}")
-        return None
+        return None, None
     
     print("🔍 Analyzing Master Dataset...")
-    master_data = analyze_dataset_completeness(master_path, "Master Integrated Dataset")
+    master_data, master_lf = analyze_dataset_completeness(master_path, "Master Integrated Dataset")
     
     if master_data:
         print(f"✅ Master Dataset Analysis Complete")
@@ -87,7 +118,7 @@ def analyze_master_dataset():
         else:
             print("   ✅ No missing data found")
     
-    return master_data
+    return master_data, master_lf
 
 def analyze_original_datasets():
     """Analyze all original source datasets"""
@@ -104,16 +135,40 @@ def analyze_original_datasets():
     
     original_datasets = {}
     
-    for file_path, dataset_name in datasets_to_analyze:
-        if Path(file_path).exists():
-            print(f"   Analyzing {dataset_name}...")
-            data = analyze_dataset_completeness(file_path, dataset_name)
-            if data:
-                original_datasets[dataset_name] = data
-                print(f"     ✅ {data['overall_completeness']:.1f}% complete")
-        else:
+    # Check every path up front so queries are only built for existing files
+    exists = {file_path: Path(file_path).exists() for file_path, _ in datasets_to_analyze}
+    available = [(file_path, dataset_name) for file_path, dataset_name in datasets_to_analyze
+                 if exists[file_path]]
+    
+    for file_path, found in exists.items():
+        if not found:
             print(f"   ⚠️  File not found: {file_path}")
     
+    # The files are independent, so run all completeness queries at once
+    # and let Polars parallelize the scans
+    try:
+        lazy_frames = [pl.scan_csv(file_path) for file_path, _ in available]
+        queries = [completeness_query(lf) for lf in lazy_frames]
+        try:
+            results = pl.collect_all(queries, engine="streaming")
+        except (pl.exceptions.PolarsError, ValueError):
+            results = pl.collect_all(queries)
+        analyzed = [
+            summarize_completeness(stats, lf.collect_schema(), file_path, dataset_name)
+            for (file_path, dataset_name), lf, stats in zip(available, lazy_frames, results)
+        ]
+    except DATASET_READ_ERRORS:
+        # One unreadable file fails the whole batch; analyze files one by one instead
+        print("   Batch analysis failed, analyzing files individually")
+        analyzed = [analyze_dataset_completeness(file_path, dataset_name)[0]
+                    for file_path, dataset_name in available]
+    
+    for (_, dataset_name), data in zip(available, analyzed):
+        print(f"   Analyzing {dataset_name}...")
+        if data:
+            original_datasets[dataset_name] = data
+            print(f"     ✅ {data['overall_completeness']:.1f}% complete")
+    
     return original_datasets
 
 def compare_datasets(master_data, original_datasets):
@@ -131,25 +186,32 @@ def compare_datasets(master_data, original_datasets):
         'data_loss_analysis': {}
     }
     
+    master_columns = master_data['columns']
+    master_column_set = set(master_columns)
+    
     # Analyze each source dataset
     for dataset_name, source_data in original_datasets.items():
         print(f"\n   📊 {dataset_name}:")
         print(f"      Original Completeness: {source_data['overall_completeness']:.1f}%")
         
         # Find corresponding columns in master dataset
-        common_columns = set(source_data['columns'].keys()) & set(master_data['columns'].keys())
+        source_columns = source_data['columns']
+        common_columns = master_column_set.intersection(source_columns)
         
         if common_columns:
             print(f"      Common columns with master: {len(common_columns)}")
             
-            # Compare completeness for common columns
-            for col in common_columns:
-                source_comp = source_data['columns'][col]['completeness']
-                master_comp = master_data['columns'][col]['completeness']
+            # Compare completeness for common columns, keeping significant changes
+            changes = {
+                col: (source_comp, master_comp)
+                for col in common_columns
+                for source_comp, master_comp in [(source_columns[col]['completeness'],
+                                                  master_columns[col]['completeness'])]
+                if abs(master_comp - source_comp) > 0.1
+            }
+            for col, (source_comp, master_comp) in changes.items():
                 change = master_comp - source_comp
-                
-                if abs(change) > 0.1:  # Significant change
-                    print(f"        {col}: {source_comp:.1f}% → {master_comp:.1f}% ({change:+.1f}%)")
+                print(f"        {col}: {source_comp:.1f}% → {master_comp:.1f}% ({change:+.1f}%)")
         
         comparison_results['source_datasets'][dataset_name] = {
             'original_completeness': source_data['overall_completeness'],
@@ -157,44 +219,58 @@ def compare_datasets(master_data, original_datasets):
             'columns': source_data['columns']
         }
 
-def identify_data_gaps(master_data):
+def identify_data_gaps(master_data, master_lf):
     """Identify specific patterns in missing data"""
     print("\n🔍 Identifying Data Gap Patterns...")
     
     if not master_data:
         return
     
-    # Load the actual data for pattern analysis
+    # Reuse the master scan from the completeness pass for pattern analysis
     try:
-        df = pl.read_csv("data/processed/master_water_scarcity_dataset_realistic.csv")
+        lf = master_lf
+        # Column names were already resolved from the schema by the completeness pass
+        columns = list(master_data['columns'])
+        
+        # Build the county and time-period group-bys together so
+        # collect_all can share the scan and run them in parallel; only
+        # groups above the reporting threshold are returned to Python
+        n_cols = len(columns)
+        missing_pct = (pl.col('total_missing') / (pl.col('total_records') * n_cols)) * 100
+        
+        def flagged_groups(keys, threshold):
+            return (
+                lf.group_by(keys)
+                .agg([
+                    pl.sum_horizontal(pl.all().null_count()).alias('total_missing'),
+                    pl.len().alias('total_records')
+                ])
+                .select(keys + [missing_pct.alias('missing_pct')])
+                .filter(pl.col('missing_pct') > threshold)
+            )
+        
+        has_county = 'County' in columns
+        has_period = 'Year' in columns and 'Month' in columns
+        queries = []
+        if has_county:
+            # More than 5% missing, worst counties first
+            queries.append(flagged_groups(['County'], 5).sort('missing_pct', descending=True))
+        if has_period:
+            # More than 10% missing, in chronological order
+            queries.append(flagged_groups(['Year', 'Month'], 10).sort(['Year', 'Month']))
+        results = iter(pl.collect_all(queries))
         
         # Analyze missing patterns by county
-        if 'County' in df.columns:
+        if has_county:
             print("   📍 Missing Data by County:")
-            county_missing = df.group_by('County').agg([
-                pl.all().null_count().alias('total_missing'),
-                pl.count().alias('total_records')
-            ])
-            
-            for row in county_missing.iter_rows():
-                county, missing, total = row
-                missing_pct = (missing / (total * len(df.columns))) * 100
-                if missing_pct > 5:  # More than 5% missing
-                    print(f"     {county}: {missing_pct:.1f}% missing data")
+            for county, pct in next(results).iter_rows():
+                print(f"     {county}: {pct:.1f}% missing data")
         
         # Analyze missing patterns by time period
-        if 'Year' in df.columns and 'Month' in df.columns:
+        if has_period:
             print("\n   📅 Missing Data by Time Period:")
-            time_missing = df.group_by(['Year', 'Month']).agg([
-                pl.all().null_count().alias('total_missing'),
-                pl.count().alias('total_records')
-            ])
-            
-            for row in time_missing.iter_rows():
-                year, month, missing, total = row
-                missing_pct = (missing / (total * len(df.columns))) * 100
-                if missing_pct > 10:  # More than 10% missing
-                    print(f"     {year}-{month:02d}: {missing_pct:.1f}% missing data")
+            for year, month, pct in next(results).iter_rows():
+                print(f"     {year}-{month:02d}: {pct:.1f}% missing data")
         
         # Analyze specific column patterns
         print("\n   🔬 Specific Column Gap Analysis:")
@@ -260,8 +336,13 @@ def generate_completeness_report(master_data, original_datasets):
     report_path = "data/reports/data_completeness_audit_report.json"
     Path(report_path).parent.mkdir(parents=True, exist_ok=True)
     
-    with open(report_path, 'w') as f:
-        json.dump(report, f, indent=2)
+    if ORJSON_AVAILABLE:
+        Path(report_path).write_bytes(
+            orjson.dumps(report, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        )
+    else:
+        with open(report_path, 'w') as f:
+            json.dump(report, f, indent=2)
     
     print(f"   ✅ Report saved to: {report_path}")
     return report
@@ -272,7 +353,7 @@ def main():
     print("=" * 50)
     
     # Analyze master dataset
-    master_data = analyze_master_dataset()
+    master_data, master_lf = analyze_master_dataset()
     
     # Analyze original datasets
     original_datasets = analyze_original_datasets()
@@ -281,7 +362,7 @@ def main():
     compare_datasets(master_data, original_datasets)
     
     # Identify data gaps
-    identify_data_gaps(master_data)
+    identify_data_gaps(master_data, master_lf)
     
     # Generate report
     report = generate_completeness_report(master_data, original_datasets)
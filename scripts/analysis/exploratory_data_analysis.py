@@ -13,12 +13,23 @@ This script performs comprehensive EDA on the master dataset to understand:
 """
 
 import polars as pl
+import matplotlib
+matplotlib.use("Agg")  # Headless backend: figures are only saved to disk
 import matplotlib.pyplot as plt
+from matplotlib.transforms import ScaledTranslation
 import seaborn as sns
 import numpy as np
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 import logging
 from datetime import datetime
+import sys
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.append(str(project_root))
+
+from scripts.analysis.parquet_cache import scan_dataset
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -28,6 +39,65 @@ logger = logging.getLogger(__name__)
 plt.style.use('default')
 sns.set_palette("husl")
 
+# Resolution for the EDA draft figures
+FIGURE_DPI = 150
+
+# Known column types of the master dataset, so the CSV is parsed without
+# dtype inference; metrics are stored as Float32 to halve scan bandwidth
+DATASET_SCHEMA = {
+    'County': pl.String, 'Year': pl.Int16, 'Month': pl.Int8, 'Month_Name': pl.String,
+    'Climate_Zone': pl.String, 'Monthly_Irrigation_Needed': pl.String,
+    'Monthly_Temperature_C': pl.Float32, 'Monthly_Humidity_Percent': pl.Float32,
+    'Monthly_Pressure_hPa': pl.Float32, 'Monthly_Evapotranspiration_mm': pl.Float32,
+    'Monthly_Precipitation_mm': pl.Float32, 'Monthly_Water_Stress_Index': pl.Float32,
+    'Monthly_Irrigation_Volume_Liters_Ha': pl.Float32, 'Monthly_Crop_Yield_Impact_Percent': pl.Float32,
+    'Monthly_Heat_Stress_Days': pl.Int16, 'Water_Scarcity_Score': pl.Float32,
+    'Agricultural_Risk_Index': pl.Float32, 'Irrigation_Priority_Score': pl.Float32,
+    'Maize_Yield_tonnes_ha': pl.Float32,
+}
+
+# Low-cardinality string columns stored as Categorical so group-bys hash codes
+CATEGORICAL_COLS = ['County', 'Month_Name', 'Climate_Zone', 'Monthly_Irrigation_Needed']
+
+# Key numeric columns to summarize
+NUMERIC_COLS = [
+    'Monthly_Temperature_C', 'Monthly_Humidity_Percent', 'Monthly_Pressure_hPa',
+    'Monthly_Evapotranspiration_mm', 'Monthly_Precipitation_mm', 'Monthly_Water_Stress_Index',
+    'Monthly_Irrigation_Volume_Liters_Ha', 'Monthly_Crop_Yield_Impact_Percent',
+    'Monthly_Heat_Stress_Days', 'Water_Scarcity_Score', 'Agricultural_Risk_Index',
+    'Irrigation_Priority_Score'
+]
+
+# Key numeric columns to check for outliers
+OUTLIER_COLS = [
+    'Monthly_Temperature_C', 'Monthly_Precipitation_mm', 'Monthly_Water_Stress_Index',
+    'Water_Scarcity_Score', 'Agricultural_Risk_Index'
+]
+
+# Key variables for correlation analysis
+CORRELATION_COLS = [
+    'Monthly_Temperature_C', 'Monthly_Precipitation_mm', 'Monthly_Water_Stress_Index',
+    'Monthly_Evapotranspiration_mm', 'Water_Scarcity_Score', 'Agricultural_Risk_Index',
+    'Irrigation_Priority_Score', 'Monthly_Heat_Stress_Days'
+]
+
+# Columns read by the monthly/yearly aggregations
+TEMPORAL_COLS = [
+    'Year', 'Month', 'Monthly_Temperature_C', 'Monthly_Precipitation_mm',
+    'Monthly_Water_Stress_Index', 'Monthly_Heat_Stress_Days', 'Water_Scarcity_Score'
+]
+
+# Columns read by the county aggregation
+COUNTY_COLS = [
+    'County', 'Monthly_Temperature_C', 'Monthly_Precipitation_mm', 'Monthly_Water_Stress_Index',
+    'Water_Scarcity_Score', 'Agricultural_Risk_Index', 'Monthly_Heat_Stress_Days'
+]
+
+
+def columns_as_lists(df, *columns):
+    """Pull whole columns into Python lists at once, ready to zip into report lines."""
+    return [df[col].to_list() for col in columns]
+
 def load_and_examine_data():
     """Load the master dataset and examine its structure."""
     logger.info("📊 Loading master dataset...")
@@ -37,7 +107,11 @@ def load_and_examine_data():
         logger.error("Master dataset not found!")
         return None
     
-    df = pl.read_csv(data_file)
+    lf = scan_dataset(data_file, DATASET_SCHEMA)
+    columns = lf.collect_schema().names()
+    df = lf.with_columns([
+        pl.col(col).cast(pl.Categorical) for col in CATEGORICAL_COLS if col in columns
+    ]).collect()
     logger.info(f"✅ Dataset loaded: {len(df):,} records, {len(df.columns)} columns")
     
     # Basic info
@@ -60,8 +134,8 @@ def analyze_data_structure(df):
     # Check for missing values
     total_records = len(df)
     logger.info(f"\n📊 Missing Value Analysis:")
-    for col in df.columns:
-        null_count = df[col].null_count()
+    null_counts = df.null_count().row(0, named=True)
+    for col, null_count in null_counts.items():
         if null_count > 0:
             percentage = (null_count / total_records) * 100
             logger.info(f"  {col}: {null_count:,} ({percentage:.1f}%)")
@@ -70,21 +144,28 @@ def analyze_data_structure(df):
     
     # Unique values for categorical columns
     logger.info(f"\n🏷️ Categorical Variables:")
-    categorical_cols = ['County', 'Month_Name', 'Climate_Zone', 'Monthly_Irrigation_Needed']
-    for col in categorical_cols:
-        if col in df.columns:
-            unique_vals = df[col].unique().to_list()
-            logger.info(f"  {col}: {len(unique_vals)} unique values")
-            if len(unique_vals) <= 20:
-                logger.info(f"    Values: {unique_vals}")
+    categorical_cols = [col for col in CATEGORICAL_COLS if col in df.columns]
+    unique_counts = df.select([
+        pl.col(col).n_unique() for col in categorical_cols
+    ]).row(0, named=True) if categorical_cols else {}
+    for col, n_unique in unique_counts.items():
+        logger.info(f"  {col}: {n_unique} unique values")
+        if n_unique <= 20:
+            logger.info(f"    Values: {df[col].unique().to_list()}")
     
     # Temporal coverage
     logger.info(f"\n📅 Temporal Coverage:")
-    years = sorted(df['Year'].unique().to_list())
-    months = sorted(df['Month'].unique().to_list())
-    logger.info(f"  Years: {years[0]} - {years[-1]} ({len(years)} years)")
-    logger.info(f"  Months: {months[0]} - {months[-1]} ({len(months)} months)")
-    logger.info(f"  Total time periods: {len(years) * len(months)}")
+    coverage = df.select([
+        pl.col('Year').min().alias('first_year'),
+        pl.col('Year').max().alias('last_year'),
+        pl.col('Year').n_unique().alias('n_years'),
+        pl.col('Month').min().alias('first_month'),
+        pl.col('Month').max().alias('last_month'),
+        pl.col('Month').n_unique().alias('n_months'),
+    ]).row(0, named=True)
+    logger.info(f"  Years: {coverage['first_year']} - {coverage['last_year']} ({coverage['n_years']} years)")
+    logger.info(f"  Months: {coverage['first_month']} - {coverage['last_month']} ({coverage['n_months']} months)")
+    logger.info(f"  Total time periods: {coverage['n_years'] * coverage['n_months']}")
     
     # Spatial coverage
     logger.info(f"\n🗺️ Spatial Coverage:")
@@ -92,240 +173,246 @@ def analyze_data_structure(df):
     logger.info(f"  Counties: {len(counties)}")
     logger.info(f"  County list: {counties}")
 
-def analyze_numeric_distributions(df):
+def build_numeric_summary(lf, columns):
+    """Lazy one-row summary (count/mean/std/min/max/median) of every column; nulls are skipped."""
+    return lf.select([
+        agg
+        for col in columns
+        for agg in (
+            pl.col(col).count().alias(f"{col}__count"),
+            pl.col(col).mean().alias(f"{col}__mean"),
+            pl.col(col).std().alias(f"{col}__std"),
+            pl.col(col).min().cast(pl.Float64).alias(f"{col}__min"),
+            pl.col(col).max().cast(pl.Float64).alias(f"{col}__max"),
+            pl.col(col).median().alias(f"{col}__median"),
+        )
+    ])
+
+def build_outlier_stats(lf, columns):
+    """Lazy one-row IQR outlier summary (Q1/Q3, count, outlier count/min/max) of every column.
+    
+    Bounds are derived inside the expressions, so quartiles and outliers come
+    from the same pass and nulls are skipped per column.
+    """
+    exprs = []
+    for col in columns:
+        values = pl.col(col)
+        q1 = values.quantile(0.25)
+        q3 = values.quantile(0.75)
+        iqr = q3 - q1
+        outliers = values.filter((values < q1 - 1.5 * iqr) | (values > q3 + 1.5 * iqr))
+        exprs.extend([
+            q1.alias(f"{col}__q1"),
+            q3.alias(f"{col}__q3"),
+            values.count().alias(f"{col}__count"),
+            outliers.len().alias(f"{col}__outliers"),
+            outliers.min().cast(pl.Float64).alias(f"{col}__min"),
+            outliers.max().cast(pl.Float64).alias(f"{col}__max"),
+        ])
+    return lf.select(exprs)
+
+def analyze_numeric_distributions(numeric_summary, columns):
     """Analyze distributions of numeric variables."""
     logger.info("\n📈 Numeric Variable Distributions")
     logger.info("=" * 50)
     
-    # Key numeric columns to analyze
-    numeric_cols = [
-        'Monthly_Temperature_C', 'Monthly_Humidity_Percent', 'Monthly_Pressure_hPa',
-        'Monthly_Evapotranspiration_mm', 'Monthly_Precipitation_mm', 'Monthly_Water_Stress_Index',
-        'Monthly_Irrigation_Volume_Liters_Ha', 'Monthly_Crop_Yield_Impact_Percent',
-        'Monthly_Heat_Stress_Days', 'Water_Scarcity_Score', 'Agricultural_Risk_Index',
-        'Irrigation_Priority_Score'
-    ]
-    
-    # Filter to existing columns
-    existing_numeric = [col for col in numeric_cols if col in df.columns]
+    stats_row = numeric_summary.row(0, named=True) if columns else {}
     
     logger.info(f"\n📊 Summary Statistics:")
-    for col in existing_numeric:
-        col_data = df[col].drop_nulls()
-        if len(col_data) > 0:
-            stats = {
-                'count': len(col_data),
-                'mean': float(col_data.mean()),
-                'std': float(col_data.std()),
-                'min': float(col_data.min()),
-                'max': float(col_data.max()),
-                'median': float(col_data.median())
-            }
+    for col in columns:
+        if stats_row[f"{col}__count"] > 0:
             logger.info(f"\n  {col}:")
-            logger.info(f"    Count: {stats['count']:,}")
-            logger.info(f"    Mean: {stats['mean']:.2f}")
-            logger.info(f"    Std: {stats['std']:.2f}")
-            logger.info(f"    Min: {stats['min']:.2f}")
-            logger.info(f"    Max: {stats['max']:.2f}")
-            logger.info(f"    Median: {stats['median']:.2f}")
-
-def analyze_temporal_patterns(df):
-    """Analyze temporal patterns and trends."""
-    logger.info("\n⏰ Temporal Pattern Analysis")
-    logger.info("=" * 50)
-    
-    # Monthly patterns
-    logger.info(f"\n📅 Monthly Patterns:")
-    monthly_stats = df.group_by("Month").agg([
+            logger.info(f"    Count: {stats_row[f'{col}__count']:,}")
+            logger.info(f"    Mean: {stats_row[f'{col}__mean']:.2f}")
+            logger.info(f"    Std: {stats_row[f'{col}__std']:.2f}")
+            logger.info(f"    Min: {stats_row[f'{col}__min']:.2f}")
+            logger.info(f"    Max: {stats_row[f'{col}__max']:.2f}")
+            logger.info(f"    Median: {stats_row[f'{col}__median']:.2f}")
+
+def build_monthly_stats(lf):
+    """Aggregate climate averages by month (shared by temporal analysis and plots)."""
+    return lf.select(TEMPORAL_COLS).group_by("Month").agg([
         pl.col("Monthly_Temperature_C").mean().alias("Avg_Temperature"),
         pl.col("Monthly_Precipitation_mm").mean().alias("Avg_Precipitation"),
         pl.col("Monthly_Water_Stress_Index").mean().alias("Avg_Water_Stress"),
         pl.col("Monthly_Heat_Stress_Days").mean().alias("Avg_Heat_Stress_Days")
     ]).sort("Month")
-    
-    for row in monthly_stats.iter_rows(named=True):
-        month = row["Month"]
-        temp = row["Avg_Temperature"]
-        precip = row["Avg_Precipitation"]
-        stress = row["Avg_Water_Stress"]
-        heat = row["Avg_Heat_Stress_Days"]
-        
-        logger.info(f"  Month {month:2d}: Temp={temp:5.1f}°C, Precip={precip:6.1f}mm, "
-                   f"Stress={stress:5.3f}, Heat={heat:5.1f} days")
-    
-    # Yearly trends
-    logger.info(f"\n📈 Yearly Trends:")
-    yearly_stats = df.group_by("Year").agg([
+
+def build_yearly_stats(lf):
+    """Aggregate climate and scarcity averages by year."""
+    return lf.select(TEMPORAL_COLS).group_by("Year").agg([
         pl.col("Monthly_Temperature_C").mean().alias("Avg_Temperature"),
         pl.col("Monthly_Precipitation_mm").mean().alias("Avg_Precipitation"),
         pl.col("Monthly_Water_Stress_Index").mean().alias("Avg_Water_Stress"),
         pl.col("Water_Scarcity_Score").mean().alias("Avg_Water_Scarcity_Score")
     ]).sort("Year")
-    
-    for row in yearly_stats.iter_rows(named=True):
-        year = row["Year"]
-        temp = row["Avg_Temperature"]
-        precip = row["Avg_Precipitation"]
-        stress = row["Avg_Water_Stress"]
-        scarcity = row["Avg_Water_Scarcity_Score"]
-        
-        logger.info(f"  {year}: Temp={temp:5.1f}°C, Precip={precip:6.1f}mm, "
-                   f"Stress={stress:5.3f}, Scarcity={scarcity:5.1f}")
 
-def analyze_spatial_patterns(df):
-    """Analyze spatial patterns across counties."""
-    logger.info("\n🗺️ Spatial Pattern Analysis")
-    logger.info("=" * 50)
-    
-    # County-level statistics
-    county_stats = df.group_by("County").agg([
+def build_county_stats(lf):
+    """Aggregate every county-level average used by the spatial, insight and plot steps."""
+    return lf.select(COUNTY_COLS).group_by("County").agg([
         pl.col("Monthly_Temperature_C").mean().alias("Avg_Temperature"),
         pl.col("Monthly_Precipitation_mm").mean().alias("Avg_Precipitation"),
         pl.col("Monthly_Water_Stress_Index").mean().alias("Avg_Water_Stress"),
         pl.col("Water_Scarcity_Score").mean().alias("Avg_Water_Scarcity_Score"),
         pl.col("Agricultural_Risk_Index").mean().alias("Avg_Agricultural_Risk"),
         pl.col("Monthly_Heat_Stress_Days").mean().alias("Avg_Heat_Stress_Days")
-    ]).sort("Avg_Water_Scarcity_Score", descending=True)
+    ])
+
+def analyze_temporal_patterns(monthly_stats, yearly_stats):
+    """Analyze temporal patterns and trends."""
+    logger.info("\n⏰ Temporal Pattern Analysis")
+    logger.info("=" * 50)
+    
+    # Monthly patterns
+    logger.info(f"\n📅 Monthly Patterns:")
+    
+    logger.info("\n".join(
+        f"  Month {month:2d}: Temp={temp:5.1f}°C, Precip={precip:6.1f}mm, "
+        f"Stress={stress:5.3f}, Heat={heat:5.1f} days"
+        for month, temp, precip, stress, heat in zip(*columns_as_lists(
+            monthly_stats, "Month", "Avg_Temperature", "Avg_Precipitation",
+            "Avg_Water_Stress", "Avg_Heat_Stress_Days"
+        ))
+    ))
+    
+    # Yearly trends
+    logger.info(f"\n📈 Yearly Trends:")
+    
+    logger.info("\n".join(
+        f"  {year}: Temp={temp:5.1f}°C, Precip={precip:6.1f}mm, "
+        f"Stress={stress:5.3f}, Scarcity={scarcity:5.1f}"
+        for year, temp, precip, stress, scarcity in zip(*columns_as_lists(
+            yearly_stats, "Year", "Avg_Temperature", "Avg_Precipitation",
+            "Avg_Water_Stress", "Avg_Water_Scarcity_Score"
+        ))
+    ))
+
+def analyze_spatial_patterns(county_stats):
+    """Analyze spatial patterns across counties."""
+    logger.info("\n🗺️ Spatial Pattern Analysis")
+    logger.info("=" * 50)
+    
+    # County-level statistics
+    county_stats = county_stats.sort("Avg_Water_Scarcity_Score", descending=True)
     
     logger.info(f"\n🏆 Counties by Water Scarcity (Highest to Lowest):")
-    for i, row in enumerate(county_stats.iter_rows(named=True)):
-        county = row["County"]
-        scarcity = row["Avg_Water_Scarcity_Score"]
-        temp = row["Avg_Temperature"]
-        precip = row["Avg_Precipitation"]
-        stress = row["Avg_Water_Stress"]
-        risk = row["Avg_Agricultural_Risk"]
-        
-        rank_icon = "🥇" if i == 0 else "🥈" if i == 1 else "🥉" if i == 2 else "  "
-        logger.info(f"  {rank_icon} {county:20s}: Scarcity={scarcity:5.1f}, "
-                   f"Temp={temp:5.1f}°C, Precip={precip:6.1f}mm, "
-                   f"Stress={stress:5.3f}, Risk={risk:5.1f}")
+    rank_icons = ["🥇", "🥈", "🥉"]
+    logger.info("\n".join(
+        f"  {rank_icons[i] if i < 3 else '  '} {county:20s}: Scarcity={scarcity:5.1f}, "
+        f"Temp={temp:5.1f}°C, Precip={precip:6.1f}mm, "
+        f"Stress={stress:5.3f}, Risk={risk:5.1f}"
+        for i, (county, scarcity, temp, precip, stress, risk) in enumerate(zip(*columns_as_lists(
+            county_stats, "County", "Avg_Water_Scarcity_Score", "Avg_Temperature",
+            "Avg_Precipitation", "Avg_Water_Stress", "Avg_Agricultural_Risk"
+        )))
+    ))
+
+def build_correlation_matrix(df, columns):
+    """Pearson correlation matrix of the given columns over complete rows, or None if there are none."""
+    corr_data = df.select(columns).drop_nulls()
+    if len(columns) < 2 or len(corr_data) == 0:
+        return None
+    return np.corrcoef(corr_data.to_numpy(), rowvar=False)
 
-def analyze_correlations(df):
+def analyze_correlations(corr_matrix, existing_vars):
     """Analyze correlations between key variables."""
     logger.info("\n🔗 Correlation Analysis")
     logger.info("=" * 50)
     
-    # Key variables for correlation analysis
-    correlation_vars = [
-        'Monthly_Temperature_C', 'Monthly_Precipitation_mm', 'Monthly_Water_Stress_Index',
-        'Monthly_Evapotranspiration_mm', 'Water_Scarcity_Score', 'Agricultural_Risk_Index',
-        'Irrigation_Priority_Score', 'Monthly_Heat_Stress_Days'
-    ]
-    
-    # Filter to existing columns
-    existing_vars = [col for col in correlation_vars if col in df.columns]
-    
-    if len(existing_vars) >= 2:
-        # Create correlation matrix
-        corr_data = df.select(existing_vars).drop_nulls()
+    if corr_matrix is not None:
+        logger.info(f"\n📊 Correlation Matrix (Top 10 strongest correlations):")
         
-        if len(corr_data) > 0:
-            logger.info(f"\n📊 Correlation Matrix (Top 10 strongest correlations):")
-            
-            # Calculate correlations
-            correlations = []
-            for i, var1 in enumerate(existing_vars):
-                for j, var2 in enumerate(existing_vars):
-                    if i < j:  # Avoid duplicates
-                        corr = float(corr_data.select(pl.corr(var1, var2)).item())
-                        correlations.append((var1, var2, corr))
-            
-            # Sort by absolute correlation strength
-            correlations.sort(key=lambda x: abs(x[2]), reverse=True)
-            
-            # Display top correlations
-            for i, (var1, var2, corr) in enumerate(correlations[:10]):
-                strength = "Strong" if abs(corr) > 0.7 else "Moderate" if abs(corr) > 0.4 else "Weak"
-                direction = "Positive" if corr > 0 else "Negative"
-                logger.info(f"  {i+1:2d}. {var1:25s} ↔ {var2:25s}: {corr:6.3f} ({strength} {direction})")
-
-def analyze_outliers_and_anomalies(df):
+        # Gather the upper-triangle pairs and rank them by absolute strength
+        rows, cols = np.triu_indices(len(existing_vars), k=1)
+        pair_corrs = corr_matrix[rows, cols]
+        top = np.argsort(-np.abs(pair_corrs), kind='stable')[:10]
+        
+        # Display top correlations
+        for i, k in enumerate(top):
+            var1, var2, corr = existing_vars[rows[k]], existing_vars[cols[k]], float(pair_corrs[k])
+            strength = "Strong" if abs(corr) > 0.7 else "Moderate" if abs(corr) > 0.4 else "Weak"
+            direction = "Positive" if corr > 0 else "Negative"
+            logger.info(f"  {i+1:2d}. {var1:25s} ↔ {var2:25s}: {corr:6.3f} ({strength} {direction})")
+
+def analyze_outliers_and_anomalies(outlier_stats, existing_cols):
     """Analyze outliers and anomalies in the data."""
     logger.info("\n🚨 Outlier and Anomaly Analysis")
     logger.info("=" * 50)
     
-    # Key numeric columns to check for outliers
-    outlier_cols = [
-        'Monthly_Temperature_C', 'Monthly_Precipitation_mm', 'Monthly_Water_Stress_Index',
-        'Water_Scarcity_Score', 'Agricultural_Risk_Index'
-    ]
-    
-    existing_cols = [col for col in outlier_cols if col in df.columns]
+    outlier_stats = outlier_stats.row(0, named=True) if existing_cols else {}
     
+    # IQR bounds for every column that has data (all-null columns have no quartiles)
+    bounds = {}
     for col in existing_cols:
-        col_data = df[col].drop_nulls()
-        if len(col_data) > 0:
-            Q1 = float(col_data.quantile(0.25))
-            Q3 = float(col_data.quantile(0.75))
+        if outlier_stats[f"{col}__q1"] is not None:
+            Q1 = float(outlier_stats[f"{col}__q1"])
+            Q3 = float(outlier_stats[f"{col}__q3"])
             IQR = Q3 - Q1
-            lower_bound = Q1 - 1.5 * IQR
-            upper_bound = Q3 + 1.5 * IQR
-            
-            outliers = col_data.filter((col_data < lower_bound) | (col_data > upper_bound))
-            
-            if len(outliers) > 0:
-                logger.info(f"\n⚠️  {col}:")
-                logger.info(f"    Q1: {Q1:.2f}, Q3: {Q3:.2f}, IQR: {IQR:.2f}")
-                logger.info(f"    Bounds: [{lower_bound:.2f}, {upper_bound:.2f}]")
-                logger.info(f"    Outliers: {len(outliers):,} ({len(outliers)/len(col_data)*100:.1f}%)")
-                logger.info(f"    Outlier range: [{float(outliers.min()):.2f}, {float(outliers.max()):.2f}]")
-            else:
-                logger.info(f"✅ {col}: No outliers detected")
-
-def generate_insights_and_recommendations(df):
+            bounds[col] = (Q1, Q3, IQR, Q1 - 1.5 * IQR, Q3 + 1.5 * IQR)
+    
+    for col, (Q1, Q3, IQR, lower_bound, upper_bound) in bounds.items():
+        n_values = outlier_stats[f"{col}__count"]
+        n_outliers = outlier_stats[f"{col}__outliers"]
+        
+        if n_outliers > 0:
+            logger.info(f"\n⚠️  {col}:")
+            logger.info(f"    Q1: {Q1:.2f}, Q3: {Q3:.2f}, IQR: {IQR:.2f}")
+            logger.info(f"    Bounds: [{lower_bound:.2f}, {upper_bound:.2f}]")
+            logger.info(f"    Outliers: {n_outliers:,} ({n_outliers/n_values*100:.1f}%)")
+            logger.info(f"    Outlier range: [{outlier_stats[f'{col}__min']:.2f}, {outlier_stats[f'{col}__max']:.2f}]")
+        else:
+            logger.info(f"✅ {col}: No outliers detected")
+
+def generate_insights_and_recommendations(df, county_stats):
     """Generate key insights and recommendations based on the EDA."""
     logger.info("\n💡 Key Insights and Recommendations")
     logger.info("=" * 50)
     
-    # Calculate overall statistics
-    total_counties = df['County'].unique().count()
-    total_years = df['Year'].unique().count()
-    total_months = df['Month'].unique().count()
-    
-    # Water scarcity insights
-    avg_scarcity = df['Water_Scarcity_Score'].mean()
-    high_scarcity_counties = df.filter(pl.col('Water_Scarcity_Score') > 70)['County'].unique().count()
-    
-    # Agricultural risk insights
-    avg_risk = df['Agricultural_Risk_Index'].mean()
-    high_risk_counties = df.filter(pl.col('Agricultural_Risk_Index') > 70)['County'].unique().count()
-    
-    # Temperature insights
-    avg_temp = df['Monthly_Temperature_C'].mean()
-    temp_range = df['Monthly_Temperature_C'].max() - df['Monthly_Temperature_C'].min()
-    
-    # Precipitation insights
-    avg_precip = df['Monthly_Precipitation_mm'].mean()
-    dry_months = df.filter(pl.col('Monthly_Precipitation_mm') < 50)['Month'].unique().count()
+    # All scalar insights in one scan; thresholded counts filter inside the expression
+    insights = df.select([
+        # Overall coverage
+        pl.col('County').n_unique().alias('total_counties'),
+        pl.col('Year').n_unique().alias('total_years'),
+        pl.col('Month').n_unique().alias('total_months'),
+        # Water scarcity insights
+        pl.col('Water_Scarcity_Score').mean().alias('avg_scarcity'),
+        pl.col('County').filter(pl.col('Water_Scarcity_Score') > 70).n_unique().alias('high_scarcity_counties'),
+        # Agricultural risk insights
+        pl.col('Agricultural_Risk_Index').mean().alias('avg_risk'),
+        pl.col('County').filter(pl.col('Agricultural_Risk_Index') > 70).n_unique().alias('high_risk_counties'),
+        # Temperature insights
+        pl.col('Monthly_Temperature_C').mean().alias('avg_temp'),
+        (pl.col('Monthly_Temperature_C').max() - pl.col('Monthly_Temperature_C').min()).alias('temp_range'),
+        # Precipitation insights
+        pl.col('Monthly_Precipitation_mm').mean().alias('avg_precip'),
+        pl.col('Month').filter(pl.col('Monthly_Precipitation_mm') < 50).n_unique().alias('dry_months'),
+    ]).row(0, named=True)
     
     logger.info(f"\n🎯 Overall Dataset Insights:")
-    logger.info(f"  • Comprehensive coverage: {total_counties} counties × {total_years} years × {total_months} months")
-    logger.info(f"  • Average water scarcity score: {avg_scarcity:.1f}/100")
-    logger.info(f"  • Counties with high water scarcity (>70): {high_scarcity_counties}")
-    logger.info(f"  • Average agricultural risk: {avg_risk:.1f}/100")
-    logger.info(f"  • Counties with high agricultural risk (>70): {high_risk_counties}")
-    logger.info(f"  • Average temperature: {avg_temp:.1f}°C (range: {temp_range:.1f}°C)")
-    logger.info(f"  • Average precipitation: {avg_precip:.1f}mm/month")
-    logger.info(f"  • Dry months (<50mm): {dry_months} out of {total_months}")
+    logger.info(f"  • Comprehensive coverage: {insights['total_counties']} counties × {insights['total_years']} years × {insights['total_months']} months")
+    logger.info(f"  • Average water scarcity score: {insights['avg_scarcity']:.1f}/100")
+    logger.info(f"  • Counties with high water scarcity (>70): {insights['high_scarcity_counties']}")
+    logger.info(f"  • Average agricultural risk: {insights['avg_risk']:.1f}/100")
+    logger.info(f"  • Counties with high agricultural risk (>70): {insights['high_risk_counties']}")
+    logger.info(f"  • Average temperature: {insights['avg_temp']:.1f}°C (range: {insights['temp_range']:.1f}°C)")
+    logger.info(f"  • Average precipitation: {insights['avg_precip']:.1f}mm/month")
+    logger.info(f"  • Dry months (<50mm): {insights['dry_months']} out of {insights['total_months']}")
     
     logger.info(f"\n🚨 Critical Findings:")
     
     # Identify most vulnerable counties
-    vulnerable_counties = df.group_by("County").agg([
-        pl.col("Water_Scarcity_Score").mean().alias("Avg_Scarcity"),
-        pl.col("Agricultural_Risk_Index").mean().alias("Avg_Risk")
-    ]).filter(
-        (pl.col("Avg_Scarcity") > 70) | (pl.col("Avg_Risk") > 70)
-    ).sort("Avg_Scarcity", descending=True)
+    vulnerable_counties = county_stats.filter(
+        (pl.col("Avg_Water_Scarcity_Score") > 70) | (pl.col("Avg_Agricultural_Risk") > 70)
+    ).sort("Avg_Water_Scarcity_Score", descending=True)
     
     if len(vulnerable_counties) > 0:
         logger.info(f"  • Most vulnerable counties (high scarcity/risk):")
-        for row in vulnerable_counties.head(5).iter_rows(named=True):
-            county = row["County"]
-            scarcity = row["Avg_Scarcity"]
-            risk = row["Avg_Risk"]
-            logger.info(f"    - {county}: Scarcity={scarcity:.1f}, Risk={risk:.1f}")
+        logger.info("\n".join(
+            f"    - {county}: Scarcity={scarcity:.1f}, Risk={risk:.1f}"
+            for county, scarcity, risk in zip(*columns_as_lists(
+                vulnerable_counties.head(5), "County", "Avg_Water_Scarcity_Score", "Avg_Agricultural_Risk"
+            ))
+        ))
     
     logger.info(f"\n💡 Recommendations for Dashboard:")
     logger.info(f"  • Focus on counties with water scarcity scores >70")
@@ -334,7 +421,7 @@ def generate_insights_and_recommendations(df):
     logger.info(f"  • Include temperature and precipitation trend analysis")
     logger.info(f"  • Provide irrigation recommendations based on water stress")
 
-def create_visualizations(df):
+def create_visualizations(county_stats, monthly_stats):
     """Create key visualizations for the EDA."""
     logger.info("\n📊 Creating Visualizations")
     logger.info("=" * 50)
@@ -348,12 +435,10 @@ def create_visualizations(df):
     fig.suptitle('Water Scarcity Dashboard - Key Insights', fontsize=16, fontweight='bold')
     
     # 1. Water Scarcity Score by County
-    county_scarcity = df.group_by("County").agg([
-        pl.col("Water_Scarcity_Score").mean().alias("Avg_Scarcity")
-    ]).sort("Avg_Scarcity", descending=True)
+    county_scarcity = county_stats.sort("Avg_Water_Scarcity_Score", descending=True)
     
     counties = county_scarcity["County"].to_list()
-    scarcity_scores = county_scarcity["Avg_Scarcity"].to_list()
+    scarcity_scores = county_scarcity["Avg_Water_Scarcity_Score"].to_list()
     
     axes[0, 0].barh(counties, scarcity_scores, color='coral')
     axes[0, 0].set_title('Average Water Scarcity Score by County')
@@ -361,12 +446,8 @@ def create_visualizations(df):
     axes[0, 0].set_ylabel('County')
     
     # 2. Monthly Temperature Patterns
-    monthly_temp = df.group_by("Month").agg([
-        pl.col("Monthly_Temperature_C").mean().alias("Avg_Temperature")
-    ]).sort("Month")
-    
-    months = monthly_temp["Month"].to_list()
-    temps = monthly_temp["Avg_Temperature"].to_list()
+    months = monthly_stats["Month"].to_list()
+    temps = monthly_stats["Avg_Temperature"].to_list()
     
     axes[0, 1].plot(months, temps, marker='o', linewidth=2, color='red')
     axes[0, 1].set_title('Monthly Temperature Patterns')
@@ -376,11 +457,7 @@ def create_visualizations(df):
     axes[0, 1].grid(True, alpha=0.3)
     
     # 3. Monthly Precipitation Patterns
-    monthly_precip = df.group_by("Month").agg([
-        pl.col("Monthly_Precipitation_mm").mean().alias("Avg_Precipitation")
-    ]).sort("Month")
-    
-    precip = monthly_precip["Avg_Precipitation"].to_list()
+    precip = monthly_stats["Avg_Precipitation"].to_list()
     
     axes[1, 0].bar(months, precip, color='skyblue', alpha=0.7)
     axes[1, 0].set_title('Monthly Precipitation Patterns')
@@ -390,13 +467,10 @@ def create_visualizations(df):
     axes[1, 0].grid(True, alpha=0.3)
     
     # 4. Water Scarcity vs Agricultural Risk
-    county_risk = df.group_by("County").agg([
-        pl.col("Water_Scarcity_Score").mean().alias("Avg_Scarcity"),
-        pl.col("Agricultural_Risk_Index").mean().alias("Avg_Risk")
-    ])
+    county_risk = county_stats
     
-    scarcity = county_risk["Avg_Scarcity"].to_list()
-    risk = county_risk["Avg_Risk"].to_list()
+    scarcity = county_risk["Avg_Water_Scarcity_Score"].to_list()
+    risk = county_risk["Avg_Agricultural_Risk"].to_list()
     
     axes[1, 1].scatter(scarcity, risk, alpha=0.7, s=100)
     axes[1, 1].set_title('Water Scarcity vs Agricultural Risk')
@@ -404,17 +478,17 @@ def create_visualizations(df):
     axes[1, 1].set_ylabel('Agricultural Risk Index')
     axes[1, 1].grid(True, alpha=0.3)
     
-    # Add county labels to scatter plot
-    for i, county in enumerate(county_risk["County"].to_list()):
-        axes[1, 1].annotate(county, (scarcity[i], risk[i]), 
-                           xytext=(5, 5), textcoords='offset points', 
-                           fontsize=8, alpha=0.8)
+    # Add county labels to scatter plot: plain Text artists sharing one
+    # 5pt x 5pt offset transform instead of an Annotation per point
+    label_transform = axes[1, 1].transData + ScaledTranslation(5 / 72, 5 / 72, fig.dpi_scale_trans)
+    label_style = {'fontsize': 8, 'alpha': 0.8, 'transform': label_transform}
+    for county, x, y in zip(county_risk["County"].to_list(), scarcity, risk):
+        axes[1, 1].text(x, y, county, **label_style)
     
     plt.tight_layout()
-    plt.savefig(output_dir / "key_insights.png", dpi=300, bbox_inches='tight')
+    fig.savefig(output_dir / "key_insights.png", dpi=FIGURE_DPI, bbox_inches='tight')
+    plt.close(fig)
     logger.info(f"✅ Visualizations saved to: {output_dir}")
-    
-    plt.close()
 
 def main():
     """Main EDA function."""
@@ -426,17 +500,37 @@ def main():
     if df is None:
         return
     
-    # Perform comprehensive EDA
-    analyze_data_structure(df)
-    analyze_numeric_distributions(df)
-    analyze_temporal_patterns(df)
-    analyze_spatial_patterns(df)
-    analyze_correlations(df)
-    analyze_outliers_and_anomalies(df)
-    generate_insights_and_recommendations(df)
+    numeric_cols = [col for col in NUMERIC_COLS if col in df.columns]
+    outlier_cols = [col for col in OUTLIER_COLS if col in df.columns]
+    correlation_cols = [col for col in CORRELATION_COLS if col in df.columns]
+    
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        # NumPy releases the GIL, so the correlation matrix is computed in the
+        # background while the Polars aggregations run and earlier sections log
+        corr_future = executor.submit(build_correlation_matrix, df, correlation_cols)
+        
+        # Build every aggregation as a lazy query and execute them together so
+        # Polars can share work between plans and run them in parallel
+        lf = df.lazy()
+        county_stats, monthly_stats, yearly_stats, numeric_summary, outlier_stats = pl.collect_all([
+            build_county_stats(lf),
+            build_monthly_stats(lf),
+            build_yearly_stats(lf),
+            build_numeric_summary(lf, numeric_cols),
+            build_outlier_stats(lf, outlier_cols),
+        ])
+        
+        # Perform comprehensive EDA; sections are logged in order
+        analyze_data_structure(df)
+        analyze_numeric_distributions(numeric_summary, numeric_cols)
+        analyze_temporal_patterns(monthly_stats, yearly_stats)
+        analyze_spatial_patterns(county_stats)
+        analyze_correlations(corr_future.result(), correlation_cols)
+    analyze_outliers_and_anomalies(outlier_stats, outlier_cols)
+    generate_insights_and_recommendations(df, county_stats)
     
     # Create visualizations
-    create_visualizations(df)
+    create_visualizations(county_stats, monthly_stats)
     
     # Save EDA summary
     output_file = Path("reports/eda_summary.md")
@@ -447,7 +541,7 @@ def main():
         f.write(f"**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
         f.write("## Dataset Overview\n\n")
         f.write(f"- **Total Records:** {len(df):,}\n")
-        f.write(f"- **Counties:** {df['County'].unique().count()}\n")
+        f.write(f"- **Counties:** {df['County'].n_unique()}\n")
         f.write(f"- **Years:** {df['Year'].min()} - {df['Year'].max()}\n")
         f.write(f"- **Months:** {df['Month'].min()} - {df['Month'].max()}\n")
         f.write(f"- **Columns:** {len(df.columns)}\n\n")
@@ -0,0 +1,52 @@
+"""
+Parquet Cache for Analysis Datasets
+===================================
+
+Shared by the analysis scripts so every CSV is parsed once and later runs
+scan a columnar copy instead.
+"""
+
+import polars as pl
+from pathlib import Path
+import hashlib
+import logging
+
+logger = logging.getLogger(__name__)
+
+def parquet_cache_path(csv_path, schema_overrides=None):
+    """Path of the Parquet copy of a CSV, tagged with the dtypes it was parsed with.
+
+    Copies parsed with different ``schema_overrides`` get different files, so
+    one caller's dtypes never leak into another's.
+    """
+    csv_path = Path(csv_path)
+    if not schema_overrides:
+        return csv_path.with_suffix(".parquet")
+    schema = sorted((col, str(dtype)) for col, dtype in schema_overrides.items())
+    tag = hashlib.sha1(repr(schema).encode()).hexdigest()[:8]
+    return csv_path.with_name(f"{csv_path.stem}.{tag}.parquet")
+
+def convert_to_parquet(csv_path, schema_overrides=None):
+    """Stream a CSV into a Parquet copy next to it and return the Parquet path.
+
+    The copy is (re)written whenever it is missing or older than the CSV. The
+    conversion runs through ``sink_parquet`` so the CSV is never fully loaded;
+    ``schema_overrides`` fixes column dtypes instead of inferring them.
+    """
+    csv_path = Path(csv_path)
+    parquet_path = parquet_cache_path(csv_path, schema_overrides)
+    if not parquet_path.exists() or parquet_path.stat().st_mtime < csv_path.stat().st_mtime:
+        pl.scan_csv(csv_path, schema_overrides=schema_overrides).sink_parquet(parquet_path)
+    return parquet_path
+
+def scan_dataset(csv_path, schema_overrides=None):
+    """Lazily scan a dataset, preferring its Parquet copy.
+
+    Later runs skip CSV parsing and only read the columns they use; if the
+    copy cannot be written the CSV is scanned directly.
+    """
+    try:
+        return pl.scan_parquet(convert_to_parquet(csv_path, schema_overrides))
+    except OSError as e:
+        logger.warning(f"Could not write Parquet cache for {csv_path}: {e}")
+        return pl.scan_csv(csv_path, schema_overrides=schema_overrides)
@@ -13,11 +13,17 @@ Does lower rainfall correlate with lower yield? Understand the basic patterns."
 """
 
 import polars as pl
-import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 from pathlib import Path
 import logging
+import sys
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.append(str(project_root))
+
+from scripts.analysis.parquet_cache import scan_dataset
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -38,43 +44,70 @@ def quick_rainfall_yield_analysis(data_path="data/master_water_scarcity_dataset_
         logger.error(f"Dataset not found: {data_path}")
         return
     
-    df = pl.read_csv(data_path)
-    logger.info(f"✅ Dataset loaded: {len(df):,} records")
+    lf = scan_dataset(data_path)
+    columns = lf.collect_schema().names()
     
     # Find rainfall column
-    rainfall_cols = [col for col in df.columns if 'rainfall' in col.lower() or 'precipitation' in col.lower()]
+    rainfall_cols = [col for col in columns if 'rainfall' in col.lower() or 'precipitation' in col.lower()]
     if not rainfall_cols:
         logger.error("No rainfall/precipitation column found")
         return
     
     rainfall_col = rainfall_cols[0]
-    logger.info(f"Using rainfall column: {rainfall_col}")
     
     # Check if we have yield data
-    if 'Maize_Yield_tonnes_ha' not in df.columns:
+    if 'Maize_Yield_tonnes_ha' not in columns:
         logger.error("No maize yield column found")
         return
     
-    # Create annual aggregated dataset
-    logger.info("Creating annual rainfall vs yield dataset...")
+    n_records = lf.select(pl.len()).collect().item()
+    logger.info(f"✅ Dataset loaded: {n_records:,} records")
+    logger.info(f"Using rainfall column: {rainfall_col}")
     
-    annual_data = df.group_by(['County', 'Year']).agg([
-        pl.col(rainfall_col).sum().alias('Annual_Rainfall_mm'),
-        pl.col('Maize_Yield_tonnes_ha').mean().alias('Avg_Yield_tonnes_ha')
-    ]).filter(
-        (pl.col('Annual_Rainfall_mm') > 0) &
-        (pl.col('Avg_Yield_tonnes_ha') > 0)
-    )
+    # Create annual aggregated dataset, reusing the cached copy from an
+    # earlier run unless the source dataset has changed since
+    data_path = Path(data_path)
+    annual_path = data_path.with_name(f"{data_path.stem}_annual.parquet")
+    if annual_path.exists() and annual_path.stat().st_mtime >= data_path.stat().st_mtime:
+        logger.info(f"Loading cached annual rainfall vs yield dataset from {annual_path}...")
+        annual_data = pl.read_parquet(annual_path)
+    else:
+        logger.info("Creating annual rainfall vs yield dataset...")
+        # Only the columns used below are read from the Parquet file
+        annual_data = lf.select([
+            pl.col('County').cast(pl.Categorical), 'Year', rainfall_col, 'Maize_Yield_tonnes_ha'
+        ]).group_by(['County', 'Year']).agg([
+            pl.col(rainfall_col).sum().alias('Annual_Rainfall_mm'),
+            pl.col('Maize_Yield_tonnes_ha').mean().alias('Avg_Yield_tonnes_ha')
+        ]).filter(
+            (pl.col('Annual_Rainfall_mm') > 0) &
+            (pl.col('Avg_Yield_tonnes_ha') > 0)
+        ).collect()
+        try:
+            annual_data.write_parquet(annual_path)
+        except OSError as e:
+            logger.warning(f"Could not write annual cache {annual_path}: {e}")
     
     logger.info(f"✅ Annual dataset: {len(annual_data):,} records")
     
-    # Calculate correlation
-    correlation_matrix = annual_data.select([
-        'Annual_Rainfall_mm', 'Avg_Yield_tonnes_ha'
-    ]).corr()
-    
-    # Extract correlation value (off-diagonal element)
-    correlation = correlation_matrix[0, 1]  # or correlation_matrix[1, 0]
+    # Correlation, the moments needed for the trend line and the rainfall
+    # quartiles (with the mean yield below/above them) in one pass
+    rainfall = pl.col('Annual_Rainfall_mm')
+    yields = pl.col('Avg_Yield_tonnes_ha')
+    q1 = rainfall.quantile(0.25, interpolation='linear')
+    q3 = rainfall.quantile(0.75, interpolation='linear')
+    moments = annual_data.select([
+        pl.corr('Annual_Rainfall_mm', 'Avg_Yield_tonnes_ha').alias('correlation'),
+        rainfall.mean().alias('mean_x'),
+        yields.mean().alias('mean_y'),
+        rainfall.std().alias('std_x'),
+        yields.std().alias('std_y'),
+        q1.alias('rainfall_q1'),
+        q3.alias('rainfall_q3'),
+        yields.filter(rainfall < q1).mean().alias('low_yield_avg'),
+        yields.filter(rainfall > q3).mean().alias('high_yield_avg'),
+    ]).row(0, named=True)
+    correlation = moments['correlation']
     
     logger.info(f"\n📊 Rainfall vs Yield Correlation: {correlation:.4f}")
     
@@ -89,11 +122,11 @@ def quick_rainfall_yield_analysis(data_path="data/master_water_scarcity_dataset_
     axes[0, 0].set_ylabel('Average Yield (tonnes/ha)')
     axes[0, 0].set_title(f'Rainfall vs Yield\nCorrelation: {correlation:.3f}')
     
-    # Add trend line
-    z = np.polyfit(annual_data['Annual_Rainfall_mm'], annual_data['Avg_Yield_tonnes_ha'], 1)
-    p = np.poly1d(z)
-    axes[0, 0].plot(annual_data['Annual_Rainfall_mm'], p(annual_data['Annual_Rainfall_mm']), 
-                    "r--", alpha=0.8, linewidth=2, label=f'Trend: y = {z[0]:.4f}x + {z[1]:.4f}')
+    # Add trend line (closed-form least squares: slope = r * sy / sx)
+    slope = correlation * moments['std_y'] / moments['std_x']
+    intercept = moments['mean_y'] - slope * moments['mean_x']
+    axes[0, 0].plot(annual_data['Annual_Rainfall_mm'], annual_data['Annual_Rainfall_mm'] * slope + intercept, 
+                    "r--", alpha=0.8, linewidth=2, label=f'Trend: y = {slope:.4f}x + {intercept:.4f}')
     axes[0, 0].legend()
     
     # 2. Rainfall distribution
@@ -142,20 +175,17 @@ def quick_rainfall_yield_analysis(data_path="data/master_water_scarcity_dataset_
         logger.info("    → Consider other variables for yield prediction")
     
     # Rainfall thresholds analysis
-    rainfall_quartiles = np.percentile(annual_data['Annual_Rainfall_mm'], [25, 50, 75])
+    rainfall_q1, rainfall_q3 = moments['rainfall_q1'], moments['rainfall_q3']
     logger.info(f"\n🌧️ Rainfall Thresholds:")
-    logger.info(f"  • Low rainfall (<{rainfall_quartiles[0]:.0f}mm): Drought risk")
-    logger.info(f"  • Medium rainfall ({rainfall_quartiles[0]:.0f}-{rainfall_quartiles[2]:.0f}mm): Normal conditions")
-    logger.info(f"  • High rainfall (>{rainfall_quartiles[2]:.0f}mm): Potential flooding risk")
+    logger.info(f"  • Low rainfall (<{rainfall_q1:.0f}mm): Drought risk")
+    logger.info(f"  • Medium rainfall ({rainfall_q1:.0f}-{rainfall_q3:.0f}mm): Normal conditions")
+    logger.info(f"  • High rainfall (>{rainfall_q3:.0f}mm): Potential flooding risk")
     
-    # Yield by rainfall category
-    low_rainfall = annual_data.filter(pl.col('Annual_Rainfall_mm') < rainfall_quartiles[0])
-    high_rainfall = annual_data.filter(pl.col('Annual_Rainfall_mm') > rainfall_quartiles[2])
+    # Yield by rainfall category (means are None when a category is empty)
+    low_yield_avg = moments['low_yield_avg']
+    high_yield_avg = moments['high_yield_avg']
     
-    if len(low_rainfall) > 0 and len(high_rainfall) > 0:
-        low_yield_avg = low_rainfall['Avg_Yield_tonnes_ha'].mean()
-        high_yield_avg = high_rainfall['Avg_Yield_tonnes_ha'].mean()
-        
+    if low_yield_avg is not None and high_yield_avg is not None:
         logger.info(f"\n📈 Yield Comparison:")
         logger.info(f"  • Low rainfall areas: {low_yield_avg:.2f} t/ha")
         logger.info(f"  • High rainfall areas: {high_yield_avg:.2f} t/ha")
@@ -20,6 +20,10 @@ class DataService:
         self.weather_data = None
         self.yield_data = None
         self.soil_data = None
+        # Rows per lower-cased county name, so county lookups are a dict hit
+        # instead of lower-casing and scanning the whole column per request
+        self._weather_by_county: Dict[str, pd.DataFrame] = {}
+        self._yield_by_county: Dict[str, pd.DataFrame] = {}
         self._load_data()
     
     def _load_data(self):
@@ -33,6 +37,7 @@ class DataService:
                 self.weather_data['Date'] = pd.to_datetime(self.weather_data['Date'])
                 self.weather_data['Year'] = self.weather_data['Date'].dt.year
                 self.weather_data['Month'] = self.weather_data['Date'].dt.month
+                self._weather_by_county = self._group_by_county(self.weather_data)
                 logger.info(f"Loaded weather data: {len(self.weather_data)} records")
             else:
                 logger.warning("Weather data file not found")
@@ -41,6 +46,7 @@ class DataService:
             yield_file = self.data_dir / "county_maize_yields_2019-2023.csv"
             if yield_file.exists():
                 self.yield_data = pd.read_csv(yield_file)
+                self._yield_by_county = self._group_by_county(self.yield_data)
                 logger.info(f"Loaded yield data: {len(self.yield_data)} records")
             else:
                 logger.warning("Yield data file not found")
@@ -56,6 +62,11 @@ class DataService:
         except Exception as e:
             logger.error(f"Error loading data: {e}")
     
+    @staticmethod
+    def _group_by_county(data: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+        """Split a dataset into its rows per lower-cased county name"""
+        return {county: rows for county, rows in data.groupby(data['County'].str.lower())}
+    
     def get_monthly_weather(self, county: str, year: int = 2023) -> List[Dict]:
         """Get monthly aggregated weather data for a county"""
         if self.weather_data is None:
@@ -63,25 +74,16 @@ class DataService:
         
         try:
             # Filter by county and year
-            county_data = self.weather_data[
-                (self.weather_data['County'].str.lower() == county.lower()) &
-                (self.weather_data['Year'] == year)
-            ]
+            county_rows = self._weather_by_county.get(county.lower())
+            county_data = county_rows[county_rows['Year'] == year] if county_rows is not None else None
             
             # If no data for requested year, try to get data from available years
-            if county_data.empty:
-                available_years = self.weather_data[
-                    self.weather_data['County'].str.lower() == county.lower()
-                ]['Year'].unique()
-                
-                if len(available_years) > 0:
+            if county_data is None or county_data.empty:
+                if county_rows is not None:
                     # Use the most recent available year
-                    fallback_year = max(available_years)
+                    fallback_year = max(county_rows['Year'].unique())
                     logger.info(f"No weather data for {county} in {year}, using {fallback_year} as fallback")
-                    county_data = self.weather_data[
-                        (self.weather_data['County'].str.lower() == county.lower()) &
-                        (self.weather_data['Year'] == fallback_year)
-                    ]
+                    county_data = county_rows[county_rows['Year'] == fallback_year]
                 else:
                     # No data for this county at all, return default data
                     logger.warning(f"No weather data available for {county}")
@@ -169,10 +171,10 @@ class DataService:
         
         try:
             # Filter by county and year
-            county_data = self.weather_data[
-                (self.weather_data['County'].str.lower() == county.lower()) &
-                (self.weather_data['Year'] == year)
-            ]
+            county_rows = self._weather_by_county.get(county.lower())
+            if county_rows is None:
+                return []
+            county_data = county_rows[county_rows['Year'] == year]
             
             if county_data.empty:
                 return []
@@ -240,11 +242,9 @@ class DataService:
             return []
         
         try:
-            county_data = self.yield_data[
-                self.yield_data['County'].str.lower() == county.lower()
-            ]
+            county_data = self._yield_by_county.get(county.lower())
             
-            if county_data.empty:
+            if county_data is None or county_data.empty:
                 return []
             
             # Sort by year and convert to list
@@ -2,12 +2,14 @@
 Database models and connection handling for the API
 """
 
-from sqlalchemy import create_engine, Column, Integer, Float, String, DateTime, Boolean, Text
+from sqlalchemy import create_engine, event, Column, Integer, Float, String, DateTime, Boolean, Text
+from sqlalchemy.engine import Connection
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import StaticPool
-from contextlib import contextmanager
+from contextlib import contextmanager, nullcontext
 import logging
+import threading
 from pathlib import Path
 from datetime import datetime, timezone
 from typing import Generator, Optional
@@ -21,11 +23,12 @@ logger = logging.getLogger(__name__)
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./agri_adapt_ai.db")
 ENGINE = None
 SessionLocal = None
+_connection_lock = nullcontext()  # Serializes transactions on a shared connection, see create_database_engine
 
 # Create database engine
 def create_database_engine():
     """Create database engine based on configuration"""
-    global ENGINE, SessionLocal
+    global ENGINE, SessionLocal, _connection_lock
     
     if DATABASE_URL.startswith("sqlite"):
         # SQLite configuration for development
@@ -35,14 +38,31 @@ def create_database_engine():
             poolclass=StaticPool,
             echo=False
         )
+        
+        # WAL lets the prediction writer commit without blocking readers, and
+        # synchronous=NORMAL skips the fsync on every commit (still safe in WAL mode)
+        @event.listens_for(ENGINE, "connect")
+        def _set_sqlite_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.close()
+        
+        # StaticPool hands every thread the same DBAPI connection, so each
+        # transaction (and the pool's rollback on return) must hold it alone
+        _connection_lock = threading.RLock()
     else:
         # PostgreSQL configuration for production
         ENGINE = create_engine(
             DATABASE_URL,
+            pool_size=20,
+            max_overflow=10,
+            pool_timeout=30,
             pool_pre_ping=True,
             pool_recycle=300,
             echo=False
         )
+        _connection_lock = nullcontext()
     
     # Create session factory
     SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=ENGINE)
@@ -55,9 +75,6 @@ def create_database_engine():
 # Base class for models
 Base = declarative_base()
 
-# Initialize database
-create_database_engine()
-
 class PredictionRecord(Base):
     """Model for storing prediction records"""
     __tablename__ = "predictions"
@@ -134,6 +151,9 @@ class APIMetrics(Base):
     def __repr__(self):
         return f"<APIMetrics(endpoint='{self.endpoint}', status_code={self.status_code})>"
 
+# Initialize database once all models are registered, so their tables get created
+create_database_engine()
+
 # Database dependency
 def get_db() -> Generator[Session, None, None]:
     """Database session dependency for FastAPI"""
@@ -153,15 +173,26 @@ def get_db_session() -> Generator[Session, None, None]:
     if not SessionLocal:
         raise RuntimeError("Database not initialized")
     
-    db = SessionLocal()
-    try:
-        yield db
-        db.commit()
-    except Exception:
-        db.rollback()
-        raise
-    finally:
-        db.close()
+    with _connection_lock:
+        db = SessionLocal()
+        try:
+            yield db
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+@contextmanager
+def get_db_connection() -> Generator[Connection, None, None]:
+    """Context manager for a pooled Core connection inside a transaction"""
+    if not ENGINE:
+        raise RuntimeError("Database not initialized")
+    
+    # Core statements (bulk inserts, probes) need no ORM session or identity map
+    with _connection_lock, ENGINE.begin() as connection:
+        yield connection
 
 def init_database():
     """Initialize database tables"""
@@ -186,10 +217,10 @@ def reset_database():
 def check_database_health() -> bool:
     """Check if database is accessible"""
     try:
-        with get_db_session() as db:
+        with get_db_connection() as connection:
             # Try to execute a simple query
             from sqlalchemy import text
-            db.execute(text("SELECT 1"))
+            connection.execute(text("SELECT 1"))
         return True
     except Exception as e:
         logger.error(f"Database health check failed: {e}")
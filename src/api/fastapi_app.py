@@ -3,21 +3,36 @@ FastAPI application for Agri-Adapt AI Maize Resilience Model
 """
 
 import time
+import asyncio
 import logging
+from collections import deque
 from contextlib import asynccontextmanager
 from pathlib import Path
 import sys
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, Union
 from datetime import datetime, timezone
+from functools import lru_cache
 import os
 
-from fastapi import FastAPI, HTTPException, Depends, BackgroundTasks, Request
+import numpy as np
+from anyio import CapacityLimiter, to_thread
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from fastapi.encoders import jsonable_encoder
 from fastapi.openapi.utils import get_openapi
 from fastapi.openapi.docs import get_swagger_ui_html
 import structlog
+from sqlalchemy import insert
+
+# Try to import orjson for faster JSON rendering
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    logging.warning("orjson not available. JSON responses will use the standard library encoder.")
 
 # Add project root to path
 project_root = Path(__file__).parent.parent.parent
@@ -37,23 +52,33 @@ from src.api.schemas import (
     HealthStatus,
     MetricsResponse
 )
-from src.api.database import get_db, PredictionRecord, ModelVersion
-from src.api.monitoring import get_metrics_collector, MetricsCollector
+from src.api.database import get_db_connection, PredictionRecord, ModelVersion
+from src.api.monitoring import get_metrics_collector, MetricsCollector, CONTENT_TYPE_LATEST
 from config.settings import KENYA_COUNTIES
 from src.api.data_service import data_service
 
-# Configure structured logging
+def orjson_renderer(_, __, event_dict: Dict[str, Any]) -> str:
+    """Render a log event as JSON with orjson; structlog's stdlib loggers expect str"""
+    # numpy scalars (e.g. model outputs) serialize as numbers, anything else unknown via repr
+    return orjson.dumps(
+        event_dict,
+        default=repr,
+        option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+    ).decode()
+
+# Configure structured logging. filter_by_level runs first so events below the
+# configured level are dropped before any other processor does work. Stack info
+# is not rendered by default; exceptions still get their traceback via exc_info.
+# Events are logged with keyword fields only (no %-style positional arguments
+# or bytes values), so no formatter or decoder pass is needed.
 structlog.configure(
     processors=[
         structlog.stdlib.filter_by_level,
         structlog.stdlib.add_logger_name,
         structlog.stdlib.add_log_level,
-        structlog.stdlib.PositionalArgumentsFormatter(),
         structlog.processors.TimeStamper(fmt="iso"),
-        structlog.processors.StackInfoRenderer(),
         structlog.processors.format_exc_info,
-        structlog.processors.UnicodeDecoder(),
-        structlog.processors.JSONRenderer()
+        orjson_renderer if ORJSON_AVAILABLE else structlog.processors.JSONRenderer()
     ],
     context_class=dict,
     logger_factory=structlog.stdlib.LoggerFactory(),
@@ -63,14 +88,114 @@ structlog.configure(
 
 logger = structlog.get_logger()
 
+class FastJSONResponse(JSONResponse):
+    """JSON response for plain dict payloads, rendered directly with orjson when available"""
+    
+    def render(self, content: Any) -> bytes:
+        if ORJSON_AVAILABLE:
+            # Unsupported values (e.g. pandas timestamps) fall back to jsonable_encoder
+            return orjson.dumps(
+                content,
+                default=jsonable_encoder,
+                option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+            )
+        return super().render(jsonable_encoder(content))
+
+# Bounds concurrent model calls so CPU-bound predictions run in worker threads
+# without blocking the event loop or oversubscribing the cores
+PREDICT_LIMITER = CapacityLimiter(os.cpu_count() or 1)
+
+# Risk bands as (resilience score threshold, risk level), checked from the top
+RISK_BANDS = ((70, "Low"), (50, "Medium"), (float("-inf"), "High"))
+
+# Shared, immutable recommendation lists per risk level
+PREDICTION_RECOMMENDATIONS = {
+    risk_level: (
+        "Maintain current soil management practices" if risk_level == "Low" else "Consider soil improvement strategies",
+        "Monitor rainfall patterns",
+        "Consider crop rotation",
+        "Optimize irrigation if available"
+    )
+    for _, risk_level in RISK_BANDS
+}
+BATCH_RECOMMENDATIONS = {risk_level: recommendations[:3] for risk_level, recommendations in PREDICTION_RECOMMENDATIONS.items()}
+
+# Ascending band edges, and per-band lookup tables indexed by the number of edges a score exceeds
+_RISK_EDGES = np.array([threshold for threshold, _ in RISK_BANDS[-2::-1]])
+_MEDIUM_RISK_EDGE, _LOW_RISK_EDGE = _RISK_EDGES.tolist()
+_RISK_LEVELS = tuple(risk_level for _, risk_level in RISK_BANDS[::-1])
+_PREDICTION_RECOMMENDATIONS_BY_RISK = tuple(PREDICTION_RECOMMENDATIONS[risk_level] for risk_level in _RISK_LEVELS)
+_BATCH_RECOMMENDATIONS_BY_RISK = tuple(BATCH_RECOMMENDATIONS[risk_level] for risk_level in _RISK_LEVELS)
+
+def risk_index(resilience_score: float) -> int:
+    """Index of a resilience score's risk band in the _RISK_LEVELS-ordered tables"""
+    score = float(resilience_score)  # numpy scalars would compare to numpy bools, which do not add
+    return (score > _MEDIUM_RISK_EDGE) + (score > _LOW_RISK_EDGE)
+
+def risk_indices(resilience_scores: List[float]) -> List[int]:
+    """Risk band indices for a batch of resilience scores, matching risk_index"""
+    return np.searchsorted(_RISK_EDGES, resilience_scores, side="left").tolist()
+
+def build_model_info(current_model: MaizeResilienceModel, feature_importance: Dict[str, float]) -> ModelInfo:
+    """Describe the loaded model for prediction responses"""
+    return ModelInfo(
+        algorithm=current_model.model.__class__.__name__ if hasattr(current_model, 'model') and current_model.model else "Unknown",
+        features=current_model.feature_names,
+        feature_importance=feature_importance,
+        version="2.0.0"
+    )
+
+# Prediction metrics are buffered here on the request path and drained into the
+# collector by a background task, keeping the collector lock off the hot path; the
+# buffer is unbounded so a burst of batches never silently evicts unflushed events
+METRICS_FLUSH_INTERVAL = 0.1  # seconds
+_METRICS_BUFFER: deque = deque()
+
+def flush_metrics_buffer():
+    """Drain buffered prediction metrics into the metrics collector"""
+    if not metrics_collector:
+        return
+    
+    events = []
+    while True:
+        try:
+            events.append(_METRICS_BUFFER.popleft())
+        except IndexError:
+            break
+    
+    if events:
+        metrics_collector.record_many(events)
+
+async def flush_metrics_periodically():
+    """Flush buffered prediction metrics until cancelled"""
+    while True:
+        await asyncio.sleep(METRICS_FLUSH_INTERVAL)
+        try:
+            # The deque is safe to drain from a worker thread, which keeps
+            # waits on the collector lock off the event loop
+            await to_thread.run_sync(flush_metrics_buffer)
+        except Exception as e:
+            logger.error("Failed to flush metrics", error=str(e))
+
+def utc_now() -> datetime:
+    """Current UTC time for response timestamps"""
+    return datetime.now(timezone.utc)
+
+async def cancel_and_wait(*tasks: asyncio.Task):
+    """Cancel background tasks and wait until each has finished"""
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
 # Global variables for model and metrics
 model: Optional[MaizeResilienceModel] = None
+model_info: Optional[ModelInfo] = None  # Built once the trained model is loaded
 metrics_collector: Optional[MetricsCollector] = None
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager"""
-    global model, metrics_collector
+    global model, model_info, metrics_collector, prediction_write_queue
     
     # Startup
     logger.info("Starting Agri-Adapt AI FastAPI application...")
@@ -104,6 +229,9 @@ async def lifespan(app: FastAPI):
                         else:
                             logger.warning("Failed to load county-specific data")
                     
+                    if model.is_trained:
+                        model_info = build_model_info(model, model.get_feature_importance())
+                    
                     model_loaded = True
                     break
             
@@ -116,8 +244,22 @@ async def lifespan(app: FastAPI):
         
         # Initialize metrics collector
         metrics_collector = get_metrics_collector()
+        metrics_flush_task = asyncio.create_task(flush_metrics_periodically())
         logger.info("Metrics collector initialized")
         
+        # Start the database writer
+        prediction_write_queue = asyncio.Queue(maxsize=WRITE_QUEUE_MAXSIZE)
+        prediction_writer_task = asyncio.create_task(write_predictions_periodically(prediction_write_queue))
+        
+        # Build the OpenAPI schema now that all routes are registered
+        app.openapi()
+        
+        # Prebuild the static counties payload; on failure the endpoint falls back per request
+        try:
+            get_available_counties()
+        except Exception as e:
+            logger.warning("Failed to prebuild counties payload", error=str(e))
+        
         logger.info("Application startup completed successfully")
         
     except Exception as e:
@@ -128,6 +270,12 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Shutting down Agri-Adapt AI FastAPI application...")
+    # Wait for the background tasks to finish any flush or write in flight, so
+    # the final drains below are the only writers left
+    await cancel_and_wait(metrics_flush_task, prediction_writer_task)
+    flush_metrics_buffer()
+    drain_prediction_queue(prediction_write_queue)
+    prediction_write_queue = None
 
 # Create FastAPI app
 app = FastAPI(
@@ -155,6 +303,7 @@ app.add_middleware(
 
 # Custom OpenAPI schema
 def custom_openapi():
+    """Build the OpenAPI schema once; lifespan prebuilds it so requests only read the cached copy"""
     if app.openapi_schema:
         return app.openapi_schema
     
@@ -175,61 +324,119 @@ def custom_openapi():
 
 app.openapi = custom_openapi
 
-# Background tasks
-async def store_prediction(
-    db,
+# Prediction records are written by a single writer task that bulk-inserts
+# whatever has queued up, so bursts of predictions share one INSERT
+WRITE_QUEUE_MAXSIZE = 10000
+WRITE_BATCH_SIZE = 500
+WRITE_FLUSH_INTERVAL = 0.01  # seconds
+prediction_write_queue: Optional[asyncio.Queue] = None
+
+def prediction_row(
     rainfall: float,
     soil_ph: float,
     organic_carbon: float,
-    county: str,
+    county: Optional[str],
     resilience_score: float,
     yield_prediction: float,
     processing_time: float
-):
-    """Store prediction in database"""
+) -> Dict[str, Any]:
+    """Build a PredictionRecord row for bulk insertion, stamped with the request's time"""
+    # Supplying the timestamp up front spares SQLAlchemy a per-row call to the
+    # column's Python default when the writer inserts the batch
+    return {
+        "rainfall": rainfall,
+        "soil_ph": soil_ph,
+        "organic_carbon": organic_carbon,
+        "county": county,
+        "resilience_score": resilience_score,
+        "yield_prediction": yield_prediction,
+        "processing_time": processing_time,
+        "model_version": "2.0.0",
+        "timestamp": utc_now()
+    }
+
+def store_predictions(rows: List[Dict[str, Any]]):
+    """Store prediction rows in database with a single bulk INSERT"""
     try:
-        prediction_record = PredictionRecord(
-            rainfall=rainfall,
-            soil_ph=soil_ph,
-            organic_carbon=organic_carbon,
-            county=county or "Unknown",
-            resilience_score=resilience_score,
-            yield_prediction=yield_prediction,
-            processing_time=processing_time,
-            model_version="2.0.0"
-        )
-        db.add(prediction_record)
-        db.commit()
-        logger.info("Prediction stored in database", prediction_id=prediction_record.id)
+        with get_db_connection() as connection:
+            connection.execute(insert(PredictionRecord), rows)
+        logger.debug("Predictions stored in database", count=len(rows))
     except Exception as e:
-        logger.error("Failed to store prediction", error=str(e))
-        db.rollback()
+        logger.error("Failed to store predictions", error=str(e), count=len(rows))
 
-async def store_batch_predictions(
-    db,
-    predictions: List[Dict[str, Any]]
-):
-    """Store batch predictions in database"""
+def queue_predictions(rows: List[Dict[str, Any]], background_tasks: BackgroundTasks):
+    """Hand prediction rows to the writer task, dropping them if it is backed up"""
+    if prediction_write_queue is None:
+        # No writer running (e.g. the app was started without its lifespan)
+        background_tasks.add_task(store_predictions, rows)
+        return
+    
+    for queued, row in enumerate(rows):
+        try:
+            prediction_write_queue.put_nowait(row)
+        except asyncio.QueueFull:
+            logger.warning("Prediction write queue full, dropping records", dropped=len(rows) - queued)
+            break
+
+async def write_predictions_periodically(queue: asyncio.Queue):
+    """Bulk-insert queued prediction rows until cancelled"""
+    while True:
+        rows = [await queue.get()]
+        try:
+            # Give a burst a moment to accumulate, then take up to a batch
+            await asyncio.sleep(WRITE_FLUSH_INTERVAL)
+        except asyncio.CancelledError:
+            store_predictions(rows)
+            raise
+        while len(rows) < WRITE_BATCH_SIZE and not queue.empty():
+            rows.append(queue.get_nowait())
+        write = asyncio.ensure_future(to_thread.run_sync(store_predictions, rows))
+        try:
+            await asyncio.shield(write)
+        except asyncio.CancelledError:
+            # Finish the write in flight, so nothing else writes alongside it
+            await write
+            raise
+
+def drain_prediction_queue(queue: asyncio.Queue):
+    """Store any rows still queued at shutdown"""
+    rows = []
+    while not queue.empty():
+        rows.append(queue.get_nowait())
+    if rows:
+        store_predictions(rows)
+
+def predict_batch_outcomes(predictions: List[PredictionRequest]) -> List[Union[Tuple[float, float, int], Exception]]:
+    """Predict a batch, returning a (resilience_score, predicted_yield, risk_index) tuple or the raised exception per input"""
+    # Predict the whole batch with a single model call; if that fails, fall
+    # back to per-item predictions so a bad input only fails its own result
     try:
-        for pred_data in predictions:
-            if pred_data.get("status") == "success":
-                prediction_record = PredictionRecord(
-                    rainfall=pred_data["input"]["rainfall"],
-                    soil_ph=pred_data["input"]["soil_ph"],
-                    organic_carbon=pred_data["input"]["organic_carbon"],
-                    county=pred_data["input"].get("county", "Unknown"),
-                    resilience_score=pred_data["prediction"]["resilience_score"],
-                    yield_prediction=pred_data["prediction"]["yield_prediction"],
-                    processing_time=pred_data.get("processing_time", 0.0),
-                    model_version="2.0.0"
-                )
-                db.add(prediction_record)
-        
-        db.commit()
-        logger.info("Batch predictions stored in database", count=len(predictions))
+        # Split the requests into per-feature columns in one pass
+        batch_result = model.predict_resilience_scores_batch(*zip(*(
+            (p.rainfall, p.soil_ph, p.organic_carbon, p.county) for p in predictions
+        )))
+        resilience_scores = batch_result["resilience_scores"]
+        return list(zip(resilience_scores, batch_result["predicted_yields"], risk_indices(resilience_scores)))
     except Exception as e:
-        logger.error("Failed to store batch predictions", error=str(e))
-        db.rollback()
+        logger.warning("Vectorized batch prediction failed, predicting items individually", error=str(e))
+    
+    outcomes = []
+    for pred_request in predictions:
+        try:
+            prediction_result = model.predict_resilience_score(
+                pred_request.rainfall,
+                pred_request.soil_ph,
+                pred_request.organic_carbon,
+                pred_request.county
+            )
+            outcomes.append((
+                prediction_result["resilience_score"],
+                prediction_result["predicted_yield"],
+                risk_index(prediction_result["resilience_score"])
+            ))
+        except Exception as item_error:
+            outcomes.append(item_error)
+    return outcomes
 
 # API Endpoints
 @app.get("/", response_model=Dict[str, Any])
@@ -258,9 +465,9 @@ async def health_check():
         # Check model health
         model_healthy = model is not None and model.is_trained
         
-        # Check database health
+        # Check database health; the probe query is blocking I/O, so it runs in a worker thread
         from src.api.database import check_database_health
-        db_healthy = check_database_health()
+        db_healthy = await to_thread.run_sync(check_database_health)
         
         # Determine overall status
         if model_healthy and db_healthy:
@@ -272,7 +479,7 @@ async def health_check():
         
         return HealthStatus(
             status=status,
-            timestamp=datetime.now(timezone.utc),
+            timestamp=utc_now(),
             service="Agri-Adapt AI API",
             version="2.0.0",
             components={
@@ -285,7 +492,7 @@ async def health_check():
         logger.error("Health check failed", error=str(e))
         return HealthStatus(
             status="unhealthy",
-            timestamp=datetime.now(timezone.utc),
+            timestamp=utc_now(),
             service="Agri-Adapt AI API",
             version="2.0.0",
             components={
@@ -295,269 +502,262 @@ async def health_check():
             }
         )
 
+@lru_cache(maxsize=1)
+def get_available_counties() -> Dict[str, Any]:
+    """Counties with available data; data_service loads its datasets once, so this is built once"""
+    # Get counties that have weather data
+    weather_counties = set()
+    if hasattr(data_service, 'weather_data') and data_service.weather_data is not None:
+        weather_counties = set(data_service.weather_data['County'].unique())
+    
+    # Get counties that have yield data
+    yield_counties = set()
+    if hasattr(data_service, 'yield_data') and data_service.yield_data is not None:
+        yield_counties = set(data_service.yield_data['County'].unique())
+    
+    # Get counties that have soil data
+    soil_counties = set()
+    if hasattr(data_service, 'soil_data') and data_service.soil_data is not None:
+        soil_counties = set(data_service.soil_data['County'].unique())
+    
+    # Combine all counties that have at least one type of data
+    available_counties = list(weather_counties | yield_counties | soil_counties)
+    
+    # Remove any invalid entries like "County" header
+    available_counties = [county for county in available_counties if county != "County" and county and county.strip()]
+    
+    # Sort alphabetically
+    available_counties.sort()
+    
+    return {
+        "counties": available_counties,
+        "count": len(available_counties),
+        "data_availability": {
+            "weather_data": len(weather_counties),
+            "yield_data": len(yield_counties),
+            "soil_data": len(soil_counties)
+        }
+    }
+
+# Basic counties list served if the data service fails
+_FALLBACK_COUNTIES = {
+    "counties": ["Baringo", "Bungoma", "Elgeyo Marakwet", "Homa Bay", "Kakamega", "Kericho", "Kilifi", "Kisii", "Kisumu", "Machakos", "Makueni", "Meru", "Migori", "Nakuru", "Nandi", "Narok", "Siaya", "Trans Nzoia", "Uasin Gishu", "West Pokot"],
+    "count": 20,
+    "data_availability": {"weather_data": 20, "yield_data": 20, "soil_data": 20}
+}
+
+def counties_response(payload: Dict[str, Any]) -> FastJSONResponse:
+    """Render a counties payload, stamped with the time of the response"""
+    timestamp = utc_now().replace(tzinfo=None).isoformat() + "Z"
+    return FastJSONResponse({**payload, "timestamp": timestamp})
+
 @app.get("/api/counties")
 async def get_counties():
     """Get list of counties with available data"""
     try:
-        # Get counties that have weather data
-        weather_counties = set()
-        if hasattr(data_service, 'weather_data') and data_service.weather_data is not None:
-            weather_counties = set(data_service.weather_data['County'].unique())
-        
-        # Get counties that have yield data
-        yield_counties = set()
-        if hasattr(data_service, 'yield_data') and data_service.yield_data is not None:
-            yield_counties = set(data_service.yield_data['County'].unique())
-        
-        # Get counties that have soil data
-        soil_counties = set()
-        if hasattr(data_service, 'soil_data') and data_service.soil_data is not None:
-            soil_counties = set(data_service.soil_data['County'].unique())
-        
-        # Combine all counties that have at least one type of data
-        available_counties = list(weather_counties | yield_counties | soil_counties)
-        
-        # Remove any invalid entries like "County" header
-        available_counties = [county for county in available_counties if county != "County" and county and county.strip()]
-        
-        # Sort alphabetically
-        available_counties.sort()
-        
-        logger.info(f"Returning {len(available_counties)} counties with available data")
-        
-        return {
-            "counties": available_counties,
-            "count": len(available_counties),
-            "timestamp": datetime.utcnow().isoformat() + "Z",
-            "data_availability": {
-                "weather_data": len(weather_counties),
-                "yield_data": len(yield_counties),
-                "soil_data": len(soil_counties)
-            }
-        }
+        return counties_response(get_available_counties())
     except Exception as e:
         logger.error(f"Error getting counties: {e}")
         # Fallback to basic counties list if data service fails
-        return {
-            "counties": ["Baringo", "Bungoma", "Elgeyo Marakwet", "Homa Bay", "Kakamega", "Kericho", "Kilifi", "Kisii", "Kisumu", "Machakos", "Makueni", "Meru", "Migori", "Nakuru", "Nandi", "Narok", "Siaya", "Trans Nzoia", "Uasin Gishu", "West Pokot"],
-            "count": 20,
-            "timestamp": datetime.utcnow().isoformat() + "Z",
-            "data_availability": {"weather_data": 20, "yield_data": 20, "soil_data": 20}
-        }
+        return counties_response(_FALLBACK_COUNTIES)
 
 @app.post("/api/predict", response_model=PredictionResponse)
 async def predict_resilience(
     request: PredictionRequest,
-    background_tasks: BackgroundTasks,
-    db=Depends(get_db)
+    background_tasks: BackgroundTasks
 ):
     """Predict maize resilience score for given parameters"""
-    start_time = time.time()
+    start_time = time.perf_counter()
     
     try:
-        # Check if model is trained
-        if not model or not model.is_trained:
+        # Check if model is trained; a missing model reads as untrained in one lookup
+        if not getattr(model, "is_trained", False):
             raise HTTPException(
                 status_code=503,
                 detail="Model not trained. Please train the model first."
             )
         
         # Make prediction with county-specific features
-        prediction_result = model.predict_resilience_score(
+        prediction_result = await to_thread.run_sync(
+            model.predict_resilience_score,
             request.rainfall,
             request.soil_ph,
             request.organic_carbon,
-            request.county
+            request.county,
+            limiter=PREDICT_LIMITER
         )
         
         # Create response
-        response = PredictionResponse(
-            prediction=PredictionResult(
+        risk = risk_index(prediction_result["resilience_score"])
+        # Every field comes from validated inputs or our own model, so the
+        # response is assembled without re-running pydantic validation
+        response = PredictionResponse.model_construct(
+            prediction=PredictionResult.model_construct(
                 resilience_score=prediction_result["resilience_score"],
                 yield_prediction=prediction_result["predicted_yield"],
                 confidence_score=0.85,  # Placeholder - implement confidence calculation
-                risk_level="Low" if prediction_result["resilience_score"] > 70 else "Medium" if prediction_result["resilience_score"] > 50 else "High",
-                recommendations=[
-                    "Maintain current soil management practices" if prediction_result["resilience_score"] > 70 else "Consider soil improvement strategies",
-                    "Monitor rainfall patterns",
-                    "Consider crop rotation",
-                    "Optimize irrigation if available"
-                ]
+                risk_level=_RISK_LEVELS[risk],
+                recommendations=_PREDICTION_RECOMMENDATIONS_BY_RISK[risk]
             ),
             input_parameters=request,
-            timestamp=datetime.now(timezone.utc),
-            model_info=ModelInfo(
-                algorithm=model.model.__class__.__name__ if hasattr(model, 'model') and model.model else "Unknown",
-                features=model.feature_names,
-                feature_importance=prediction_result["feature_importance"],
-                version="2.0.0"
-            )
+            timestamp=utc_now(),
+            model_info=model_info or build_model_info(model, prediction_result["feature_importance"])
         )
         
         # Calculate processing time
-        processing_time = time.time() - start_time
+        processing_time = time.perf_counter() - start_time
         
         # Record metrics
         if metrics_collector:
-            metrics_collector.record_prediction(
-                rainfall=request.rainfall,
-                soil_ph=request.soil_ph,
-                organic_carbon=request.organic_carbon,
-                resilience_score=prediction_result["resilience_score"],
-                processing_time=processing_time,
-                success=True
-            )
+            _METRICS_BUFFER.append((
+                request.rainfall,
+                request.soil_ph,
+                request.organic_carbon,
+                prediction_result["resilience_score"],
+                processing_time,
+                True
+            ))
         
         # Store prediction in background
-        background_tasks.add_task(
-            store_prediction,
-            db,
+        queue_predictions([prediction_row(
             request.rainfall,
             request.soil_ph,
             request.organic_carbon,
-            request.county,
+            request.county or "Unknown",
             prediction_result["resilience_score"],
             prediction_result["predicted_yield"],
             processing_time
-        )
+        )], background_tasks)
         
-        logger.info("Prediction completed successfully",
-                   county=request.county,
-                   resilience_score=prediction_result["resilience_score"],
-                   processing_time=processing_time)
+        logger.debug("Prediction completed successfully",
+                    county=request.county,
+                    resilience_score=prediction_result["resilience_score"],
+                    processing_time=processing_time)
         
         return response
         
     except Exception as e:
-        processing_time = time.time() - start_time
+        processing_time = time.perf_counter() - start_time
         
         # Record error metrics
         if metrics_collector:
-            metrics_collector.record_prediction(
-                rainfall=request.rainfall,
-                soil_ph=request.soil_ph,
-                organic_carbon=request.organic_carbon,
-                resilience_score=0.0,
-                processing_time=processing_time,
-                success=False
-            )
+            _METRICS_BUFFER.append((
+                request.rainfall,
+                request.soil_ph,
+                request.organic_carbon,
+                0.0,
+                processing_time,
+                False
+            ))
         
         logger.error("Prediction failed", error=str(e), processing_time=processing_time)
         raise HTTPException(status_code=500, detail="Internal server error during prediction")
 
+def build_batch_results(
+    predictions: List[PredictionRequest],
+    outcomes: List[Union[Tuple[float, float, int], Exception]]
+) -> Tuple[List[BatchPredictionResult], List[Tuple[PredictionRequest, float, float]]]:
+    """Build a result per input, along with (input, resilience_score, predicted_yield) per success"""
+    results = []
+    successes = []
+    
+    # Like the single predict response these hold only validated inputs and
+    # model output, so skip revalidation
+    for pred_request, outcome in zip(predictions, outcomes):
+        if isinstance(outcome, Exception):
+            # Handle individual prediction failure
+            results.append(BatchPredictionResult.model_construct(
+                input=pred_request,
+                prediction=None,
+                status="error",
+                error=str(outcome)
+            ))
+        else:
+            resilience_score, predicted_yield, risk = outcome
+            results.append(BatchPredictionResult.model_construct(
+                input=pred_request,
+                prediction=PredictionResult.model_construct(
+                    resilience_score=resilience_score,
+                    yield_prediction=predicted_yield,
+                    confidence_score=0.85,
+                    risk_level=_RISK_LEVELS[risk],
+                    recommendations=_BATCH_RECOMMENDATIONS_BY_RISK[risk]
+                ),
+                status="success"
+            ))
+            successes.append((pred_request, resilience_score, predicted_yield))
+    
+    return results, successes
+
+def record_batch_successes(
+    successes: List[Tuple[PredictionRequest, float, float]],
+    item_processing_time: float,
+    background_tasks: BackgroundTasks
+):
+    """Buffer metrics for and queue storage of a batch's successful predictions"""
+    # Record metrics
+    if metrics_collector:
+        _METRICS_BUFFER.extend(
+            (p.rainfall, p.soil_ph, p.organic_carbon, resilience_score, item_processing_time, True)
+            for p, resilience_score, _ in successes
+        )
+    
+    # Store successful predictions in background
+    if successes:
+        queue_predictions([
+            prediction_row(
+                p.rainfall,
+                p.soil_ph,
+                p.organic_carbon,
+                p.county,
+                resilience_score,
+                predicted_yield,
+                item_processing_time
+            )
+            for p, resilience_score, predicted_yield in successes
+        ], background_tasks)
+
 @app.post("/api/predict/batch", response_model=BatchPredictionResponse)
 async def batch_predict(
     batch_request: BatchPredictionRequest,
-    background_tasks: BackgroundTasks,
-    db=Depends(get_db)
+    background_tasks: BackgroundTasks
 ):
     """Process multiple predictions in batch"""
-    start_time = time.time()
-    results = []
-    successful_count = 0
-    failed_count = 0
+    start_time = time.perf_counter()
     
     try:
-        # Check if model is trained
-        if not model or not model.is_trained:
+        # Check if model is trained; a missing model reads as untrained in one lookup
+        if not getattr(model, "is_trained", False):
             raise HTTPException(
                 status_code=503,
                 detail="Model not trained. Please train the model first."
             )
         
-        # Process each prediction
-        for pred_request in batch_request.predictions:
-            try:
-                # Make prediction with county-specific features
-                prediction_result = model.predict_resilience_score(
-                    pred_request.rainfall,
-                    pred_request.soil_ph,
-                    pred_request.organic_carbon,
-                    pred_request.county
-                )
-                
-                # Create result
-                result = BatchPredictionResult(
-                    input=pred_request,
-                    prediction=PredictionResult(
-                        resilience_score=prediction_result["resilience_score"],
-                        yield_prediction=prediction_result["predicted_yield"],
-                        confidence_score=0.85,
-                        risk_level="Low" if prediction_result["resilience_score"] > 70 else "Medium" if prediction_result["resilience_score"] > 50 else "High",
-                        recommendations=[
-                            "Maintain current soil management practices" if prediction_result["resilience_score"] > 70 else "Consider soil improvement strategies",
-                            "Monitor rainfall patterns",
-                            "Consider crop rotation"
-                        ]
-                    ),
-                    status="success"
-                )
-                
-                successful_count += 1
-                
-            except Exception as e:
-                # Handle individual prediction failure
-                result = BatchPredictionResult(
-                    input=pred_request,
-                    prediction=None,
-                    status="error",
-                    error=str(e)
-                )
-                failed_count += 1
-            
-            results.append(result)
+        # Run the CPU-bound model call in a worker thread
+        predictions = batch_request.predictions
+        outcomes = await to_thread.run_sync(predict_batch_outcomes, predictions, limiter=PREDICT_LIMITER)
+        results, successes = build_batch_results(predictions, outcomes)
+        successful_count = len(successes)
+        failed_count = len(results) - successful_count
         
         # Calculate total processing time
-        total_processing_time = time.time() - start_time
-        
-        # Record metrics
-        if metrics_collector:
-            for i, result in enumerate(results):
-                if result.status == "success":
-                    metrics_collector.record_prediction(
-                        rainfall=result.input.rainfall,
-                        soil_ph=result.input.soil_ph,
-                        organic_carbon=result.input.organic_carbon,
-                        resilience_score=result.prediction.resilience_score,
-                        processing_time=total_processing_time / len(results),
-                        success=True
-                    )
-        
-        # Store successful predictions in background
-        successful_predictions = [
-            {
-                "input": {
-                    "rainfall": r.input.rainfall,
-                    "soil_ph": r.input.soil_ph,
-                    "organic_carbon": r.input.organic_carbon,
-                    "county": r.input.county
-                },
-                "prediction": {
-                    "resilience_score": r.prediction.resilience_score,
-                    "yield_prediction": r.prediction.yield_prediction
-                },
-                "status": r.status,
-                "processing_time": total_processing_time / len(results)
-            }
-            for r in results if r.status == "success"
-        ]
+        total_processing_time = time.perf_counter() - start_time
         
-        if successful_predictions:
-            background_tasks.add_task(store_batch_predictions, db, successful_predictions)
+        record_batch_successes(successes, total_processing_time / len(results), background_tasks)
         
-        response = BatchPredictionResponse(
+        response = BatchPredictionResponse.model_construct(
             results=results,
             total_processed=len(results),
             successful_count=successful_count,
             failed_count=failed_count,
-            timestamp=datetime.now(timezone.utc)
+            timestamp=utc_now()
         )
         
-        logger.info("Batch prediction completed",
-                   total=len(results),
-                   successful=successful_count,
-                   failed=failed_count,
-                   processing_time=total_processing_time)
+        logger.debug("Batch prediction completed",
+                    total=len(results),
+                    successful=successful_count,
+                    failed=failed_count,
+                    processing_time=total_processing_time)
         
         return response
         
@@ -565,6 +765,47 @@ async def batch_predict(
         logger.error("Batch prediction failed", error=str(e))
         raise HTTPException(status_code=500, detail="Internal server error during batch prediction")
 
+# Result lines rendered and sent together by the streaming batch endpoint
+NDJSON_CHUNK_LINES = 100
+
+@app.post("/api/predict/batch/stream")
+async def batch_predict_stream(
+    batch_request: BatchPredictionRequest,
+    background_tasks: BackgroundTasks
+):
+    """Process multiple predictions in batch, streaming one JSON result per line (NDJSON) in chunks"""
+    start_time = time.perf_counter()
+    
+    # Check if model is trained; a missing model reads as untrained in one lookup
+    if not getattr(model, "is_trained", False):
+        raise HTTPException(
+            status_code=503,
+            detail="Model not trained. Please train the model first."
+        )
+    
+    try:
+        # Predict the whole batch up front with one model call; only the
+        # serialization is streamed
+        predictions = batch_request.predictions
+        outcomes = await to_thread.run_sync(predict_batch_outcomes, predictions, limiter=PREDICT_LIMITER)
+        results, successes = build_batch_results(predictions, outcomes)
+        record_batch_successes(successes, (time.perf_counter() - start_time) / len(results), background_tasks)
+    except Exception as e:
+        logger.error("Batch prediction failed", error=str(e))
+        raise HTTPException(status_code=500, detail="Internal server error during batch prediction")
+    
+    # Rows go out in chunks from an async generator: a sync one would cost a
+    # threadpool hop per row, and clients can parse early chunks while later
+    # ones are still being rendered
+    async def ndjson_chunks():
+        for start in range(0, len(results), NDJSON_CHUNK_LINES):
+            yield b"".join(
+                result.model_dump_json().encode() + b"\n"
+                for result in results[start:start + NDJSON_CHUNK_LINES]
+            )
+    
+    return StreamingResponse(ndjson_chunks(), media_type="application/x-ndjson")
+
 @app.get("/api/model/status", response_model=ModelStatus)
 async def get_model_status():
     """Get model training status and information"""
@@ -584,6 +825,13 @@ async def get_model_status():
         } if model.is_trained else None
     )
 
+# Frontend display names for the model's backend feature names
+FEATURE_DISPLAY_NAMES = {
+    "Annual_Rainfall_mm": "Water Availability",
+    "Soil_pH": "Soil Health",
+    "Soil_Organic_Carbon": "Soil Fertility"
+}
+
 @app.get("/api/model/feature-importance", response_model=FeatureImportance)
 async def get_feature_importance():
     """Get feature importance scores with mapped display names"""
@@ -591,24 +839,16 @@ async def get_feature_importance():
         raise HTTPException(status_code=503, detail="Model not trained")
     
     try:
-        feature_importance = model.get_feature_importance()
-        
         # Map backend feature names to frontend display names
-        feature_mapping = {
-            "Annual_Rainfall_mm": "Water Availability",
-            "Soil_pH": "Soil Health", 
-            "Soil_Organic_Carbon": "Soil Fertility"
+        mapped_importance = {
+            FEATURE_DISPLAY_NAMES.get(feature, feature): importance
+            for feature, importance in model.get_feature_importance().items()
         }
         
-        # Create mapped feature importance with display names
-        mapped_importance = {}
-        for feature, importance in feature_importance.items():
-            display_name = feature_mapping.get(feature, feature)
-            mapped_importance[display_name] = importance
-        
-        return FeatureImportance(
+        # Built from the model's own importances, so skip revalidation
+        return FeatureImportance.model_construct(
             feature_importance=mapped_importance,
-            timestamp=datetime.now(timezone.utc)
+            timestamp=utc_now()
         )
     except Exception as e:
         logger.error("Failed to get feature importance", error=str(e))
@@ -621,6 +861,7 @@ async def get_metrics():
         raise HTTPException(status_code=503, detail="Metrics collector not available")
     
     try:
+        flush_metrics_buffer()
         metrics = metrics_collector.get_metrics()
         
         return MetricsResponse(
@@ -629,23 +870,33 @@ async def get_metrics():
             failed_predictions=metrics["prediction_metrics"]["failed_requests"],
             average_response_time=metrics["prediction_metrics"]["processing_time"]["average_seconds"],
             predictions_per_hour=metrics["prediction_metrics"]["requests_per_hour"],
-            timestamp=datetime.now(timezone.utc)
+            prediction_cache=model.prediction_cache_info() if model else None,
+            timestamp=utc_now()
         )
     except Exception as e:
         logger.error("Failed to get metrics", error=str(e))
         raise HTTPException(status_code=500, detail="Failed to retrieve metrics")
 
+# Rendered Prometheus exposition, reused by scrapes until it is PROMETHEUS_TTL seconds old
+PROMETHEUS_TTL = 5.0
+_prometheus_cache: Dict[str, Any] = {"body": b"", "rendered_at": float("-inf")}
+
 @app.get("/metrics")
 async def prometheus_metrics():
     """Prometheus metrics endpoint"""
     if not metrics_collector:
-        return "# Metrics collector not available\n"
+        return Response(content="# Metrics collector not available\n", media_type=CONTENT_TYPE_LATEST)
     
     try:
-        return metrics_collector.get_prometheus_metrics()
+        now = time.monotonic()
+        if now - _prometheus_cache["rendered_at"] >= PROMETHEUS_TTL:
+            flush_metrics_buffer()
+            _prometheus_cache["body"] = metrics_collector.get_prometheus_metrics().encode("utf-8")
+            _prometheus_cache["rendered_at"] = now
+        return Response(content=_prometheus_cache["body"], media_type=CONTENT_TYPE_LATEST)
     except Exception as e:
         logger.error("Failed to get Prometheus metrics", error=str(e))
-        return f"# Error retrieving metrics: {e}\n"
+        return Response(content=f"# Error retrieving metrics: {e}\n", media_type=CONTENT_TYPE_LATEST)
 
 @app.get("/api/historical/{county}")
 async def get_historical_data(county: str, year: int = 2023):
@@ -663,15 +914,15 @@ async def get_historical_data(county: str, year: int = 2023):
         # Get soil properties
         soil_properties = data_service.get_soil_properties(county)
         
-        return {
+        return FastJSONResponse({
             "county": county,
             "year": year,
             "monthly_resilience": monthly_resilience,
             "monthly_weather": monthly_weather,
             "yield_trends": yield_trends,
             "soil_properties": soil_properties,
-            "timestamp": datetime.now(timezone.utc)
-        }
+            "timestamp": utc_now()
+        })
         
     except Exception as e:
         logger.error(f"Error getting historical data for {county}: {e}")
@@ -686,12 +937,12 @@ async def get_monthly_weather(county: str, year: int = 2023):
         if not weather_data:
             raise HTTPException(status_code=404, detail=f"Weather data not found for {county}")
         
-        return {
+        return FastJSONResponse({
             "county": county,
             "year": year,
             "monthly_data": weather_data,
-            "timestamp": datetime.now(timezone.utc)
-        }
+            "timestamp": utc_now()
+        })
         
     except Exception as e:
         logger.error(f"Error getting weather data for {county}: {e}")
@@ -712,12 +963,12 @@ async def get_climate_history(county: str, years: int = 5):
         if not climate_data:
             raise HTTPException(status_code=404, detail=f"Climate data not found for {county}")
         
-        return {
+        return FastJSONResponse({
             "county": county,
             "years_covered": list(climate_data.keys()),
             "climate_data": climate_data,
-            "timestamp": datetime.now(timezone.utc)
-        }
+            "timestamp": utc_now()
+        })
         
     except Exception as e:
         logger.error(f"Error getting climate history for {county}: {e}")
@@ -729,10 +980,10 @@ async def get_market_costs():
     try:
         market_data = data_service.get_market_data()
         
-        return {
+        return FastJSONResponse({
             "market_data": market_data,
-            "timestamp": datetime.now(timezone.utc)
-        }
+            "timestamp": utc_now()
+        })
         
     except Exception as e:
         logger.error(f"Error getting market costs: {e}")
@@ -762,10 +1013,10 @@ async def get_market_prices():
             "last_updated": market_data["last_updated"]
         }
         
-        return {
+        return FastJSONResponse({
             "prices": prices,
-            "timestamp": datetime.now(timezone.utc)
-        }
+            "timestamp": utc_now()
+        })
         
     except Exception as e:
         logger.error(f"Error getting market prices: {e}")
@@ -780,11 +1031,11 @@ async def get_soil_data(county: str):
         if not soil_data:
             raise HTTPException(status_code=404, detail=f"Soil data not found for {county}")
         
-        return {
+        return FastJSONResponse({
             "county": county,
             "soil_properties": soil_data,
-            "timestamp": datetime.now(timezone.utc)
-        }
+            "timestamp": utc_now()
+        })
         
     except Exception as e:
         logger.error(f"Error getting soil data for {county}: {e}")
@@ -799,30 +1050,34 @@ async def get_yield_data(county: str):
         if not yield_data:
             raise HTTPException(status_code=404, detail=f"Yield data not found for {county}")
         
-        return {
+        return FastJSONResponse({
             "county": county,
             "yield_trends": yield_data,
-            "timestamp": datetime.now(timezone.utc)
-        }
+            "timestamp": utc_now()
+        })
         
     except Exception as e:
         logger.error(f"Error getting yield data for {county}: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to retrieve yield data: {str(e)}")
 
 # Error handlers
+# Probe endpoints polled by orchestrators and scrapers; their HTTP errors are not logged
+UNLOGGED_ERROR_PATHS = frozenset({"/health", "/metrics"})
+
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request: Request, exc: HTTPException):
     """Handle HTTP exceptions"""
-    logger.warning("HTTP exception occurred",
-                   path=request.url.path,
-                   status_code=exc.status_code,
-                   detail=exc.detail)
+    if request.url.path not in UNLOGGED_ERROR_PATHS:
+        logger.warning("HTTP exception occurred",
+                       path=request.url.path,
+                       status_code=exc.status_code,
+                       detail=exc.detail)
     
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=exc.status_code,
         content={
             "error": exc.detail,
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "timestamp": utc_now().isoformat(),
             "path": str(request.url.path)
         }
     )
@@ -830,16 +1085,17 @@ async def http_exception_handler(request: Request, exc: HTTPException):
 @app.exception_handler(Exception)
 async def general_exception_handler(request: Request, exc: Exception):
     """Handle general exceptions"""
+    # Formatting the traceback is costly during error storms, so only do it when debugging
     logger.error("Unhandled exception occurred",
                  path=request.url.path,
                  error=str(exc),
-                 exc_info=True)
+                 exc_info=logger.isEnabledFor(logging.DEBUG))
     
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=500,
         content={
             "error": "Internal server error",
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "timestamp": utc_now().isoformat(),
             "path": str(request.url.path)
         }
     )
@@ -17,6 +17,7 @@ try:
     PROMETHEUS_AVAILABLE = True
 except ImportError:
     PROMETHEUS_AVAILABLE = False
+    CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
     logging.warning("Prometheus client not available. Metrics will be limited to internal collection.")
 
 logger = logging.getLogger(__name__)
@@ -49,6 +50,22 @@ class PredictionMetrics:
             self.max_processing_time = processing_time
         
         self.average_processing_time = self.total_processing_time / self.total_requests
+    
+    def update_many(self, processing_times: List[float], successful: int):
+        """Update metrics with a batch of requests, of which `successful` succeeded"""
+        if not processing_times:
+            return
+        
+        self.total_requests += len(processing_times)
+        self.total_processing_time = sum(processing_times, self.total_processing_time)
+        self.successful_requests += successful
+        self.failed_requests += len(processing_times) - successful
+        
+        # Update processing time statistics
+        self.min_processing_time = min(self.min_processing_time, min(processing_times))
+        self.max_processing_time = max(self.max_processing_time, max(processing_times))
+        
+        self.average_processing_time = self.total_processing_time / self.total_requests
 
 @dataclass
 class FeatureMetrics:
@@ -68,6 +85,37 @@ class FeatureMetrics:
         self._update_numerical_stats('soil_ph', soil_ph)
         self._update_numerical_stats('organic_carbon', organic_carbon)
     
+    def update_many(self, rainfalls: List[float], soil_phs: List[float],
+                    organic_carbons: List[float], county: str):
+        """Update feature metrics with a batch of requests from one county"""
+        if not rainfalls:
+            return
+        
+        self.county_distribution[county] = self.county_distribution.get(county, 0) + len(rainfalls)
+        
+        self._update_numerical_stats_many('rainfall', rainfalls)
+        self._update_numerical_stats_many('soil_ph', soil_phs)
+        self._update_numerical_stats_many('organic_carbon', organic_carbons)
+    
+    def _update_numerical_stats_many(self, feature_name: str, values: List[float]):
+        """Update numerical feature statistics with a batch of values"""
+        stats = getattr(self, f"{feature_name}_stats")
+        
+        if not stats:
+            stats.update({
+                'count': 0,
+                'sum': 0.0,
+                'min': float('inf'),
+                'max': float('-inf'),
+                'mean': 0.0
+            })
+        
+        stats['count'] += len(values)
+        stats['sum'] = sum(values, stats['sum'])
+        stats['min'] = min(stats['min'], min(values))
+        stats['max'] = max(stats['max'], max(values))
+        stats['mean'] = stats['sum'] / stats['count']
+    
     def _update_numerical_stats(self, feature_name: str, value: float):
         """Update numerical feature statistics"""
         stats = getattr(self, f"{feature_name}_stats")
@@ -152,27 +200,77 @@ class MetricsCollector:
                          success: bool = True, endpoint: str = "/api/predict"):
         """Record prediction metrics"""
         with self.lock:
-            # Update internal metrics
-            self.prediction_metrics.update(processing_time, success)
-            self.feature_metrics.update(rainfall, soil_ph, organic_carbon, "Unknown")
-            self.response_times.append(processing_time)
-            self.endpoint_usage[endpoint] += 1
+            self._record_prediction(rainfall, soil_ph, organic_carbon, resilience_score,
+                                    processing_time, success, endpoint)
+    
+    def record_many(self, events: List[tuple], endpoint: str = "/api/predict"):
+        """
+        Record a batch of prediction metrics under a single lock acquisition
+        
+        Args:
+            events: Tuples of (rainfall, soil_ph, organic_carbon, resilience_score,
+                processing_time, success), as passed to record_prediction
+            endpoint: Endpoint the predictions were served from
+        """
+        if not events:
+            return
+        
+        # Aggregate per column so each statistic and counter is updated once per batch
+        rainfalls, soil_phs, organic_carbons, _, processing_times, successes = zip(*events)
+        successful = sum(successes)
+        failed = len(events) - successful
+        
+        with self.lock:
+            self.prediction_metrics.update_many(processing_times, successful)
+            self.feature_metrics.update_many(rainfalls, soil_phs, organic_carbons, "Unknown")
+            self.response_times.extend(processing_times)
+            self.endpoint_usage[endpoint] += len(events)
             
-            if not success:
-                self.error_counts[endpoint] += 1
+            if failed:
+                self.error_counts[endpoint] += failed
             
             # Update Prometheus metrics if available
             if PROMETHEUS_AVAILABLE:
                 try:
-                    status = "success" if success else "failure"
-                    self.prediction_requests_total.labels(status=status, endpoint=endpoint).inc()
+                    if successful:
+                        self.prediction_requests_total.labels(status="success", endpoint=endpoint).inc(successful)
+                    if failed:
+                        self.prediction_requests_total.labels(status="failure", endpoint=endpoint).inc(failed)
+                    
+                    # Histograms have no bulk observe, but the labelled child is resolved once
+                    duration = self.prediction_processing_duration.labels(endpoint=endpoint)
+                    for processing_time in processing_times:
+                        if processing_time > 0:
+                            duration.observe(processing_time)
                     
-                    if processing_time > 0:
-                        self.prediction_processing_duration.labels(endpoint=endpoint).observe(processing_time)
-                        
                 except Exception as e:
                     logger.error(f"Failed to update Prometheus metrics: {e}")
     
+    def _record_prediction(self, rainfall: float, soil_ph: float, organic_carbon: float,
+                           resilience_score: float, processing_time: float,
+                           success: bool, endpoint: str):
+        """Update prediction metrics; the caller must hold self.lock"""
+        # Update internal metrics
+        self.prediction_metrics.update(processing_time, success)
+        self.feature_metrics.update(rainfall, soil_ph, organic_carbon, "Unknown")
+        self.response_times.append(processing_time)
+        self.endpoint_usage[endpoint] += 1
+        
+        if not success:
+            self.error_counts[endpoint] += 1
+        
+        # Update Prometheus metrics if available
+        if PROMETHEUS_AVAILABLE:
+            try:
+                status = "success" if success else "failure"
+                self.prediction_requests_total.labels(status=status, endpoint=endpoint).inc()
+                
+                if processing_time > 0:
+                    self.prediction_processing_duration.labels(endpoint=endpoint).observe(processing_time)
+                    
+            except Exception as e:
+                logger.error(f"Failed to update Prometheus metrics: {e}")
+    
     def record_request(self, endpoint: str, method: str, status_code: int, 
                       processing_time: float, user_agent: str = None, ip_address: str = None):
         """Record general request metrics"""
@@ -338,7 +436,7 @@ def monitor_performance(endpoint: str = None):
     """Decorator to monitor endpoint performance"""
     def decorator(func):
         def wrapper(*args, **kwargs):
-            start_time = time.time()
+            start_time = time.perf_counter()
             success = True
             
             try:
@@ -348,7 +446,7 @@ def monitor_performance(endpoint: str = None):
                 success = False
                 raise
             finally:
-                processing_time = time.time() - start_time
+                processing_time = time.perf_counter() - start_time
                 endpoint_name = endpoint or func.__name__
                 
                 # Record metrics
@@ -3,7 +3,7 @@ Pydantic schemas for API request/response validation
 """
 
 from pydantic import BaseModel, Field, field_validator
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 
 class PredictionRequest(BaseModel):
@@ -21,7 +21,7 @@ class PredictionResult(BaseModel):
     yield_prediction: float = Field(..., description="Predicted maize yield in tonnes/ha")
     confidence_score: Optional[float] = Field(None, ge=0, le=1, description="Prediction confidence (0-1)")
     risk_level: str = Field(..., description="Risk assessment level")
-    recommendations: List[str] = Field(..., description="List of farming recommendations")
+    recommendations: Tuple[str, ...] = Field(..., description="List of farming recommendations")
 
 class ModelInfo(BaseModel):
     """Schema for model information"""
@@ -87,6 +87,7 @@ class MetricsResponse(BaseModel):
     failed_predictions: int = Field(..., description="Number of failed predictions")
     average_response_time: float = Field(..., description="Average response time in seconds")
     predictions_per_hour: float = Field(..., description="Predictions per hour rate")
+    prediction_cache: Optional[Dict[str, Optional[int]]] = Field(None, description="Prediction cache statistics (hits, misses, maxsize, currsize)")
     timestamp: datetime = Field(..., description="Metrics timestamp")
 
 class ErrorResponse(BaseModel):
@@ -6,7 +6,26 @@ import polars as pl
 import numpy as np
 import pandas as pd
 import joblib
+import hashlib
+from joblib import parallel_backend
 import logging
+import os
+import pickle
+from functools import lru_cache
+from pathlib import Path
+
+# Optionally route scikit-learn estimators through Intel's oneDAL kernels
+# (USE_SKLEARNEX=1); the patch must be applied before they are imported
+SKLEARNEX_AVAILABLE = False
+if os.getenv("USE_SKLEARNEX", "").lower() in ("1", "true", "yes"):
+    try:
+        from sklearnex import patch_sklearn
+        patch_sklearn()
+        SKLEARNEX_AVAILABLE = True
+    except ImportError:
+        logging.warning("USE_SKLEARNEX is set but scikit-learn-intelex is not available. Using stock scikit-learn.")
+
+from sklearn.base import clone
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.preprocessing import StandardScaler, OneHotEncoder
 from sklearn.model_selection import train_test_split, cross_val_score
@@ -14,12 +33,65 @@ from sklearn.metrics import r2_score, mean_squared_error, mean_absolute_error
 import warnings
 warnings.filterwarnings('ignore')
 
+# Try to import ONNX Runtime for serving exported forests
+try:
+    import onnxruntime as ort
+    ONNXRUNTIME_AVAILABLE = True
+except ImportError:
+    ONNXRUNTIME_AVAILABLE = False
+
+# Try to import Numba for compiling the forest traversal
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 from config.settings import MODEL_PARAMS, BENCHMARK_YIELD
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# ONNX metadata entry holding the fingerprint of the forest an export was made from
+ONNX_FINGERPRINT_KEY = "forest_fingerprint"
+
+# Number of distinct (rainfall, soil_ph, organic_carbon, county) predictions to memoize
+PREDICTION_CACHE_SIZE = 4096
+
+# Trees are evaluated serially at inference; callers such as the API already
+# spread concurrent predictions across worker threads
+INFERENCE_N_JOBS = 1
+
+# Up to this many rows, all trees are walked together over the flattened forest;
+# larger batches are faster evaluated one tree at a time
+FLAT_FOREST_MAX_ROWS = 128
+
+
+def _walk_forest(X, roots, feature, threshold, left, right, value):
+    """Average the flattened forest's predictions for float64 rows, one row at a time"""
+    n_trees = roots.shape[0]
+    y_hat = np.empty(X.shape[0], dtype=np.float64)
+    for i in range(X.shape[0]):
+        # Trees are added strictly in order, as the forest's accumulation does
+        total = 0.0
+        for t in range(n_trees):
+            node = roots[t]
+            while left[node] != node:
+                if X[i, feature[node]] <= threshold[node]:
+                    node = left[node]
+                else:
+                    node = right[node]
+            total += value[node]
+        y_hat[i] = total / n_trees
+    return y_hat
+
+
+# Compiled, the walk beats both numpy paths at any batch size; it runs serially
+# like the trees do (see INFERENCE_N_JOBS) but releases the GIL for the API's workers
+if NUMBA_AVAILABLE:
+    _walk_forest = njit(cache=True, nogil=True)(_walk_forest)
+
 class MaizeResilienceModel:
     """
     Random Forest model for predicting maize drought resilience scores with county-specific features
@@ -28,13 +100,27 @@ class MaizeResilienceModel:
     def __init__(self, model_params=None):
         """Initialize the model with parameters"""
         self.model_params = model_params or MODEL_PARAMS
-        self.model = RandomForestRegressor(**self.model_params)
+        
+        # A bootstrapped forest also scores itself on its out-of-bag samples while
+        # it fits, which train reports in place of refitting it for cross-validation.
+        # The flag is only set on the estimator: model_params stays as configured
+        forest_params = dict(self.model_params)
+        if forest_params.get('bootstrap', True):
+            forest_params.setdefault('oob_score', True)
+        self.model = RandomForestRegressor(**forest_params)
         self.scaler = StandardScaler()
         self.encoder = OneHotEncoder(sparse_output=False, handle_unknown='ignore')
         self.feature_names = None
         self.is_trained = False
         self.model_type = "county_specific_random_forest"
         self.county_data = None  # Store county-specific data
+        self._feature_importance = None  # Cached once the model is trained
+        self._inference_trees = None  # Fitted trees evaluated directly at inference, when available
+        self._flat_forest = None  # The same trees' nodes packed into flat arrays, see _flatten_forest
+        self._scaling = None  # (mean, scale) of the fitted scaler, applied directly at inference
+        self._onnx_session = None  # ONNX Runtime session serving the forest, when one was exported
+        # Per-instance memo of single predictions; cleared whenever the model or county data changes
+        self._cached_prediction = lru_cache(maxsize=PREDICTION_CACHE_SIZE)(self._predict_resilience_score)
         
     def load_county_data(self, data_path='data/master_water_scarcity_dataset.csv'):
         """Load county-specific data from master dataset"""
@@ -69,6 +155,7 @@ class MaizeResilienceModel:
             )
             
             self.county_data = county_stats
+            self._cached_prediction.cache_clear()
             logger.info(f"Loaded county-specific data for {len(county_stats)} counties")
             logger.info(f"Features: {list(county_stats.columns)}")
             
@@ -99,16 +186,20 @@ class MaizeResilienceModel:
         if missing_cols:
             raise ValueError(f"Missing required columns: {missing_cols}")
         
-        # Extract numerical features
-        X_numerical = df.select(numerical_features).to_numpy()
-        
         # Encode county as categorical feature
         X_categorical = df.select(categorical_features).to_numpy()
         X_county_encoded = self.encoder.fit_transform(X_categorical)
         
-        # Combine features
-        X = np.hstack([X_numerical, X_county_encoded])
-        y = df.select(target_col).to_numpy().ravel()
+        # Combine features in one C-ordered matrix (the layout sklearn works on),
+        # copying each numerical column straight in rather than through an
+        # intermediate Fortran-ordered array and np.hstack
+        X = np.empty((df.height, len(numerical_features) + X_county_encoded.shape[1]))
+        for i, col in enumerate(numerical_features):
+            X[:, i] = df.get_column(col).to_numpy()
+        X[:, len(numerical_features):] = X_county_encoded
+        
+        # A single column converts without copying when it has no nulls
+        y = df.get_column(target_col).to_numpy()
         
         # Create comprehensive feature names
         county_feature_names = self.encoder.get_feature_names_out(['County'])
@@ -120,8 +211,14 @@ class MaizeResilienceModel:
         
         return X, y
     
-    def train(self, X, y, test_size=0.2, random_state=42):
-        """Train the Random Forest model with county-specific features"""
+    def train(self, X, y, test_size=0.2, random_state=42, cross_validate=False):
+        """
+        Train the Random Forest model with county-specific features
+        
+        The forest's out-of-bag R² is reported as oob_r2. 5-fold cross-validation
+        refits the forest five times, so it only runs when requested or when the
+        forest has no out-of-bag score; otherwise cv_r2_mean and cv_r2_std are None.
+        """
         logger.info("Training maize resilience model with county-specific features...")
         
         # Split data
@@ -133,7 +230,9 @@ class MaizeResilienceModel:
         X_train_scaled = self.scaler.fit_transform(X_train)
         X_test_scaled = self.scaler.transform(X_test)
         
-        # Train model
+        # Train model with the configured parallelism
+        if 'n_jobs' in self.model_params:
+            self.model.set_params(n_jobs=self.model_params['n_jobs'])
         self.model.fit(X_train_scaled, y_train)
         
         # Evaluate
@@ -141,45 +240,50 @@ class MaizeResilienceModel:
         r2 = r2_score(y_test, y_pred)
         rmse = np.sqrt(mean_squared_error(y_test, y_pred))
         
-        # Cross-validation
-        cv_scores = cross_val_score(
-            self.model, X_train_scaled, y_train, cv=5, scoring='r2'
-        )
+        # Cross-validation, with the folds fitted side by side in threads: the
+        # trees release the GIL while they grow, and no estimator or data is
+        # pickled over to worker processes. Each fold's forest grows its trees
+        # serially, so the folds alone occupy the configured workers
+        oob_score = getattr(self.model, 'oob_score_', None)
+        cv_scores = None
+        if cross_validate or oob_score is None:
+            n_jobs = self.model_params.get('n_jobs')
+            fold_params = {param: value for param, value in (('n_jobs', 1), ('oob_score', False))
+                           if param in self.model.get_params()}
+            fold_model = clone(self.model).set_params(**fold_params)
+            with parallel_backend('threading', n_jobs=n_jobs):
+                cv_scores = cross_val_score(
+                    fold_model, X_train_scaled, y_train, cv=5, scoring='r2', n_jobs=n_jobs
+                )
         
         logger.info(f"Model trained successfully!")
         logger.info(f"R² Score: {r2:.4f}")
         logger.info(f"RMSE: {rmse:.4f}")
-        logger.info(f"Cross-validation R²: {cv_scores.mean():.4f} (+/- {cv_scores.std() * 2:.4f})")
+        if oob_score is not None:
+            logger.info(f"Out-of-bag R²: {oob_score:.4f}")
+        if cv_scores is not None:
+            logger.info(f"Cross-validation R²: {cv_scores.mean():.4f} (+/- {cv_scores.std() * 2:.4f})")
         
         self.is_trained = True
+        self._specialize_for_inference()
         
         return {
             'r2_score': r2,
             'rmse': rmse,
-            'cv_r2_mean': cv_scores.mean(),
-            'cv_r2_std': cv_scores.std()
+            'oob_r2': oob_score,
+            'cv_r2_mean': cv_scores.mean() if cv_scores is not None else None,
+            'cv_r2_std': cv_scores.std() if cv_scores is not None else None
         }
     
-    def predict_resilience_score(self, rainfall, soil_ph, organic_carbon, county):
+    def _county_statistics(self, county, log_details=True):
         """
-        Predict maize resilience score (0-100%) with county-specific features
+        Look up the county-specific statistics used as model features
         
-        Args:
-            rainfall: Annual rainfall in mm
-            soil_ph: Soil pH value
-            organic_carbon: Soil organic carbon content
-            county: County name for county-specific prediction
-            
         Returns:
-            dict: Contains resilience_score, predicted_yield, and feature_importance
+            tuple: (avg_temperature, temp_std, avg_humidity, humidity_std, avg_clay_content,
+            avg_precipitation, precip_std, climate_variability, soil_quality_score), where an
+            avg_precipitation or soil_quality_score of None means it is derived from the inputs
         """
-        if not self.is_trained:
-            raise ValueError("Model must be trained before making predictions")
-        
-        # Load county-specific data if not already loaded
-        if self.county_data is None:
-            self.load_county_data()
-        
         # Get county-specific features from loaded data
         if self.county_data is not None and county in self.county_data.index:
             county_stats = self.county_data.loc[county]
@@ -209,7 +313,7 @@ class MaizeResilienceModel:
                 logger.warning(f"NaN clay content data for {county}, using default")
             
             if pd.isna(avg_precipitation) or pd.isna(precip_std):
-                avg_precipitation, precip_std = rainfall, 50.0
+                avg_precipitation, precip_std = None, 50.0
                 logger.warning(f"NaN precipitation data for {county}, using defaults")
             
             if pd.isna(climate_variability):
@@ -217,32 +321,43 @@ class MaizeResilienceModel:
                 logger.warning(f"NaN climate variability data for {county}, using default")
             
             if pd.isna(soil_quality_score):
-                soil_quality_score = soil_ph * 0.3 + organic_carbon * 0.4 + 20.0 * 0.3
+                soil_quality_score = None
                 logger.warning(f"NaN soil quality data for {county}, calculating from inputs")
             
-            logger.info(f"Using county-specific data for {county}:")
-            logger.info(f"  Temperature: {avg_temperature:.1f}°C ± {temp_std:.1f}°C")
-            logger.info(f"  Humidity: {avg_humidity:.1f}% ± {humidity_std:.1f}%")
-            logger.info(f"  Soil Clay: {avg_clay_content:.1f}%")
-            logger.info(f"  Precipitation: {avg_precipitation:.1f}mm ± {precip_std:.1f}mm")
-        else:
-            # Fallback to hardcoded defaults if county not found
-            logger.warning(f"County '{county}' not found in loaded county data. Using default values.")
-            avg_temperature = 25.0
-            temp_std = 5.0
-            avg_humidity = 70.0
-            humidity_std = 10.0
-            avg_clay_content = 20.0
+            if log_details and logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Using county-specific data for {county}:")
+                logger.debug(f"  Temperature: {avg_temperature:.1f}°C ± {temp_std:.1f}°C")
+                logger.debug(f"  Humidity: {avg_humidity:.1f}% ± {humidity_std:.1f}%")
+                logger.debug(f"  Soil Clay: {avg_clay_content:.1f}%")
+                if avg_precipitation is not None:
+                    logger.debug(f"  Precipitation: {avg_precipitation:.1f}mm ± {precip_std:.1f}mm")
+            
+            return (avg_temperature, temp_std, avg_humidity, humidity_std, avg_clay_content,
+                    avg_precipitation, precip_std, climate_variability, soil_quality_score)
+        
+        # Fallback to hardcoded defaults if county not found
+        logger.warning(f"County '{county}' not found in loaded county data. Using default values.")
+        return (25.0, 5.0, 70.0, 10.0, 20.0, None, 50.0, 65.0, None)
+    
+    def _build_numerical_features(self, rainfall, soil_ph, organic_carbon, county, log_details=True,
+                                  county_statistics=None):
+        """Build the numerical feature row for one input, filling county-specific values"""
+        if county_statistics is None:
+            county_statistics = self._county_statistics(county, log_details)
+        (avg_temperature, temp_std, avg_humidity, humidity_std, avg_clay_content,
+         avg_precipitation, precip_std, climate_variability, soil_quality_score) = county_statistics
+        
+        # Values the county data could not supply are derived from the inputs
+        if avg_precipitation is None:
             avg_precipitation = rainfall
-            precip_std = 50.0
-            climate_variability = 65.0
+        if soil_quality_score is None:
             soil_quality_score = soil_ph * 0.3 + organic_carbon * 0.4 + 20.0 * 0.3
         
         # Check if this is the enhanced model (has more features)
         if hasattr(self, 'model_type') and self.model_type == 'enhanced_county_specific':
             # Enhanced model expects 14 numerical features + county encoding
             # Use county-specific data instead of hardcoded defaults
-            X_numerical = np.array([[
+            return [
                 rainfall,                    # Annual_Rainfall_mm (user input)
                 avg_precipitation,           # Avg_Rainfall_mm (county-specific)
                 precip_std,                  # Rainfall_Std_mm (county-specific)
@@ -257,52 +372,144 @@ class MaizeResilienceModel:
                 rainfall / (avg_temperature + 1),  # Water_Stress_Index (dynamic)
                 soil_quality_score,          # Soil_Quality_Score (county-specific)
                 climate_variability          # Climate_Variability (county-specific)
-            ]])
+            ]
         else:
             # Original model expects 3 basic features
-            X_numerical = np.array([[rainfall, soil_ph, organic_carbon]])
-        
-        # Encode county
+            return [rainfall, soil_ph, organic_carbon]
+    
+    def _encode_counties(self, counties):
+        """One-hot encode counties, using the first training county for any that cannot be encoded"""
         try:
-            X_county_encoded = self.encoder.transform([[county]])
-        except Exception as e:
-            logger.warning(f"County '{county}' not in training data, using default encoding")
+            return self.encoder.transform([[county] for county in counties])
+        except Exception:
+            if len(counties) > 1:
+                # Encode row by row so only the offending counties get the default
+                return np.vstack([self._encode_counties([county]) for county in counties])
+            logger.warning(f"County '{counties[0]}' not in training data, using default encoding")
             # Use first county as default if unknown
-            X_county_encoded = self.encoder.transform([self.encoder.categories_[0][:1]])
+            return self.encoder.transform([self.encoder.categories_[0][:1]])
+    
+    def predict_resilience_score(self, rainfall, soil_ph, organic_carbon, county):
+        """
+        Predict maize resilience score (0-100%) with county-specific features
+        
+        Args:
+            rainfall: Annual rainfall in mm
+            soil_ph: Soil pH value
+            organic_carbon: Soil organic carbon content
+            county: County name for county-specific prediction
+            
+        Returns:
+            dict: Contains resilience_score, predicted_yield, and feature_importance
+        """
+        if not self.is_trained:
+            raise ValueError("Model must be trained before making predictions")
+        
+        # Predictions are deterministic, so repeated inputs are served from the cache;
+        # callers get their own copy of the result and its feature importance
+        result = dict(self._cached_prediction(rainfall, soil_ph, organic_carbon, county))
+        result['feature_importance'] = dict(result['feature_importance'])
+        return result
+    
+    def _predict_resilience_score(self, rainfall, soil_ph, organic_carbon, county):
+        """Uncached single prediction backing predict_resilience_score"""
+        # Load county-specific data if not already loaded
+        if self.county_data is None:
+            self.load_county_data()
+        
+        X_numerical = np.array([self._build_numerical_features(rainfall, soil_ph, organic_carbon, county)])
+        
+        # Encode county
+        X_county_encoded = self._encode_counties([county])
         
         # Combine features
         X_combined = np.hstack([X_numerical, X_county_encoded])
         
         # Scale features
-        X_scaled = self.scaler.transform(X_combined)
+        X_scaled = self._scale_features(X_combined)
         
         # Predict yield
-        predicted_yield = self.model.predict(X_scaled)[0]
+        predicted_yield = self._predict_yields(X_scaled)[0]
         
         # Calculate resilience score (0-100%) with more robust calculation
         raw_score = (predicted_yield / BENCHMARK_YIELD) * 100
         resilience_score = max(0, min(100, raw_score))  # Ensure 0-100 range
         
-        # Get feature importance
-        feature_importance = dict(zip(self.feature_names, self.model.feature_importances_))
-        
-        logger.info(f"County-specific prediction for {county}:")
-        logger.info(f"  Input: Rainfall={rainfall}mm, pH={soil_ph}, OC={organic_carbon}%")
-        logger.info(f"  Predicted Yield: {predicted_yield:.2f} t/ha")
-        logger.info(f"  Raw Score: {raw_score:.1f}%")
-        logger.info(f"  Final Resilience Score: {resilience_score:.1f}%")
-        logger.info(f"  Benchmark Yield: {BENCHMARK_YIELD} t/ha")
+        # Per-prediction details are only formatted when debug logging is on
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"County-specific prediction for {county}:")
+            logger.debug(f"  Input: Rainfall={rainfall}mm, pH={soil_ph}, OC={organic_carbon}%")
+            logger.debug(f"  Predicted Yield: {predicted_yield:.2f} t/ha")
+            logger.debug(f"  Raw Score: {raw_score:.1f}%")
+            logger.debug(f"  Final Resilience Score: {resilience_score:.1f}%")
+            logger.debug(f"  Benchmark Yield: {BENCHMARK_YIELD} t/ha")
         
         return {
             'resilience_score': round(resilience_score, 1),
             'predicted_yield': round(predicted_yield, 2),
-            'feature_importance': feature_importance,
+            'feature_importance': self.get_feature_importance(),
             'benchmark_yield': BENCHMARK_YIELD,
             'county': county
         }
     
-    def save_model(self, filepath):
-        """Save the trained model and preprocessing components"""
+    def predict_resilience_scores_batch(self, rainfall, soil_ph, organic_carbon, counties):
+        """
+        Predict maize resilience scores for many inputs with a single model call
+        
+        Args:
+            rainfall: Sequence of annual rainfall values in mm
+            soil_ph: Sequence of soil pH values
+            organic_carbon: Sequence of soil organic carbon contents
+            counties: Sequence of county names
+            
+        Returns:
+            dict: Contains resilience_scores and predicted_yields (lists aligned
+            with the inputs) and the shared feature_importance
+        """
+        if not self.is_trained:
+            raise ValueError("Model must be trained before making predictions")
+        
+        # Load county-specific data if not already loaded
+        if self.county_data is None:
+            self.load_county_data()
+        
+        # Look up each distinct county once, then build every row from those statistics
+        statistics = {county: self._county_statistics(county, log_details=False) for county in set(counties)}
+        X_numerical = np.array([
+            self._build_numerical_features(r, ph, oc, county, county_statistics=statistics[county])
+            for r, ph, oc, county in zip(rainfall, soil_ph, organic_carbon, counties)
+        ])
+        X_county_encoded = self._encode_counties(list(counties))
+        
+        # Scale and predict all rows at once
+        X_scaled = self._scale_features(np.hstack([X_numerical, X_county_encoded]))
+        predicted_yields = self._predict_yields(X_scaled)
+        
+        # Resilience score (0-100%) per row, rounded like the single prediction
+        resilience_scores = np.clip((predicted_yields / BENCHMARK_YIELD) * 100, 0, 100)
+        
+        logger.debug("Batch prediction for %d inputs completed", len(predicted_yields))
+        
+        return {
+            'resilience_scores': [float(round(score, 1)) for score in resilience_scores],
+            'predicted_yields': [float(round(y, 2)) for y in predicted_yields],
+            'feature_importance': self.get_feature_importance(),
+            'benchmark_yield': BENCHMARK_YIELD
+        }
+    
+    def prediction_cache_info(self):
+        """Get hit/miss statistics of the single-prediction cache"""
+        return self._cached_prediction.cache_info()._asdict()
+    
+    def save_model(self, filepath, compress=0):
+        """
+        Save the trained model and preprocessing components
+        
+        Args:
+            filepath: Destination of the joblib dump
+            compress: joblib compression, e.g. 'lz4' for archival copies; the default
+                uncompressed dump is the one load_model can memory-map
+        """
         if not self.is_trained:
             raise ValueError("Model must be trained before saving")
         
@@ -315,12 +522,57 @@ class MaizeResilienceModel:
             'model_type': self.model_type
         }
         
-        joblib.dump(model_data, filepath)
+        joblib.dump(model_data, filepath, compress=compress, protocol=pickle.HIGHEST_PROTOCOL)
         logger.info(f"Model saved to {filepath}")
     
+    def export_onnx(self, filepath):
+        """
+        Export the trained forest to ONNX, for load_model to serve it with ONNX Runtime
+        
+        The export takes scaled features and is saved next to the joblib model under
+        the same name with an .onnx suffix, tagged with the forest's fingerprint so
+        load_model only serves it alongside this exact forest. ONNX Runtime evaluates
+        the trees in float32, so its predictions can differ from scikit-learn's in
+        the last digits.
+        
+        Returns:
+            Path of the exported file, or None if skl2onnx is not available
+        """
+        if not self.is_trained:
+            raise ValueError("Model must be trained before exporting")
+        
+        try:
+            from skl2onnx import convert_sklearn
+            from skl2onnx.common.data_types import FloatTensorType
+        except ImportError:
+            logger.warning("skl2onnx not available, skipping ONNX export")
+            return None
+        
+        onnx_path = Path(filepath).with_suffix('.onnx')
+        onnx_model = convert_sklearn(
+            self.model,
+            initial_types=[("X", FloatTensorType([None, self.model.n_features_in_]))]
+        )
+        onnx_model.metadata_props.add(key=ONNX_FINGERPRINT_KEY, value=self._forest_fingerprint())
+        onnx_path.write_bytes(onnx_model.SerializeToString())
+        logger.info(f"Model exported to {onnx_path}")
+        return onnx_path
+    
+    def _forest_fingerprint(self):
+        """Digest of the fitted trees, identifying the forest an ONNX export was made from"""
+        digest = hashlib.sha256()
+        for estimator in getattr(self.model, 'estimators_', []):
+            tree = estimator.tree_
+            for array in (tree.children_left, tree.children_right, tree.feature, tree.threshold, tree.value):
+                digest.update(np.ascontiguousarray(array).tobytes())
+        return digest.hexdigest()
+    
     def load_model(self, filepath):
         """Load a trained model and preprocessing components"""
-        model_data = joblib.load(filepath)
+        # Arrays in an uncompressed dump are memory-mapped read-only rather than
+        # copied, so server workers loading the same file share their pages;
+        # nothing below writes to the loaded arrays in place
+        model_data = joblib.load(filepath, mmap_mode='r')
         
         # Handle different model save formats
         self.model = model_data['model']
@@ -344,18 +596,152 @@ class MaizeResilienceModel:
                               hasattr(self.model, 'feature_importances_') and 
                               self.feature_names is not None)
         
+        self._specialize_for_inference()
+        
+        # Serve predictions from an exported ONNX copy of the forest when one sits next
+        # to the model; an export left over from an earlier forest is ignored
+        onnx_path = Path(filepath).with_suffix('.onnx')
+        if self.is_trained and ONNXRUNTIME_AVAILABLE and onnx_path.exists():
+            session = ort.InferenceSession(str(onnx_path), providers=["CPUExecutionProvider"])
+            exported_fingerprint = session.get_modelmeta().custom_metadata_map.get(ONNX_FINGERPRINT_KEY)
+            if exported_fingerprint is not None and exported_fingerprint == self._forest_fingerprint():
+                self._onnx_session = session
+                logger.info(f"Serving predictions from ONNX model {onnx_path}")
+            else:
+                logger.warning(f"Ignoring ONNX model {onnx_path}: it was not exported from this forest")
+        
         logger.info(f"Model loaded from {filepath}")
         logger.info(f"Model trained status: {self.is_trained}")
         logger.info(f"Model type: {self.model_type}")
         logger.info(f"Feature names: {self.feature_names}")
     
+    def _specialize_for_inference(self):
+        """Reset derived state and configure a newly trained or loaded model for prediction"""
+        # Dispatching a handful of rows across a joblib worker pool costs more
+        # than walking the trees serially
+        if self.model is not None and 'n_jobs' in self.model.get_params():
+            self.model.set_params(n_jobs=INFERENCE_N_JOBS)
+        
+        # A single-output random forest is evaluated tree by tree at inference,
+        # unless oneDAL is serving its predictions
+        if (not SKLEARNEX_AVAILABLE and isinstance(self.model, RandomForestRegressor)
+                and getattr(self.model, 'n_outputs_', None) == 1):
+            self._inference_trees = list(self.model.estimators_)
+            self._flat_forest = self._flatten_forest(self._inference_trees)
+        else:
+            self._inference_trees = None
+            self._flat_forest = None
+        
+        # Likewise a fitted StandardScaler is applied as its mean and scale vectors
+        if isinstance(self.scaler, StandardScaler) and hasattr(self.scaler, 'scale_'):
+            self._scaling = (
+                self.scaler.mean_ if self.scaler.with_mean else None,
+                self.scaler.scale_ if self.scaler.with_std else None
+            )
+        else:
+            self._scaling = None
+        
+        # Any ONNX export belongs to the previous model
+        self._onnx_session = None
+        
+        self._feature_importance = None
+        self._cached_prediction.cache_clear()
+    
+    def _scale_features(self, X):
+        """Scale freshly built feature rows as the fitted scaler does, reusing their buffer"""
+        if self._scaling is None:
+            return self.scaler.transform(X)
+        
+        # The same in-place operations as StandardScaler.transform, without its
+        # input validation; callers hand over a matrix they no longer need, so
+        # a float64 one is scaled in place rather than copied
+        mean, scale = self._scaling
+        X_scaled = np.asarray(X, dtype=np.float64)
+        if mean is not None:
+            X_scaled -= mean
+        if scale is not None:
+            X_scaled /= scale
+        return X_scaled
+    
+    @staticmethod
+    def _flatten_forest(estimators):
+        """
+        Pack the nodes of all trees into contiguous arrays indexed by a global node id
+        
+        Returns:
+            tuple: (roots, feature, threshold, left, right, value, depth), where leaves
+            point back at themselves so a walk of `depth` steps ends on every tree's leaf
+        """
+        trees = [estimator.tree_ for estimator in estimators]
+        roots = np.cumsum([0] + [tree.node_count for tree in trees[:-1]])
+        
+        feature = np.concatenate([tree.feature for tree in trees]).astype(np.intp)
+        threshold = np.concatenate([tree.threshold for tree in trees])
+        left = np.concatenate([tree.children_left + root for tree, root in zip(trees, roots)]).astype(np.intp)
+        right = np.concatenate([tree.children_right + root for tree, root in zip(trees, roots)]).astype(np.intp)
+        value = np.concatenate([tree.value.ravel() for tree in trees])
+        
+        leaves = np.concatenate([tree.children_left == -1 for tree in trees])
+        node_ids = np.flatnonzero(leaves)
+        feature[leaves] = 0
+        threshold[leaves] = np.inf
+        left[leaves] = node_ids
+        right[leaves] = node_ids
+        
+        return roots, feature, threshold, left, right, value, max(tree.max_depth for tree in trees)
+    
+    def _predict_flat(self, X):
+        """Average the trees' predictions for float32 rows by walking all trees at once"""
+        roots, feature, threshold, left, right, value, depth = self._flat_forest
+        
+        # One step down every (tree, row) path per level, compared in float64 like
+        # sklearn's tree traversal; leaves stay put once reached
+        X = X.astype(np.float64)
+        nodes = np.repeat(roots[:, None], X.shape[0], axis=1)
+        rows = np.arange(X.shape[0])
+        for _ in range(depth):
+            go_left = X[rows, feature[nodes]] <= threshold[nodes]
+            nodes = np.where(go_left, left[nodes], right[nodes])
+        
+        # A cumulative sum adds the trees strictly in order, as the forest's
+        # accumulation does (a plain sum may add them pairwise)
+        return value[nodes].cumsum(axis=0)[-1] / len(roots)
+    
+    def _predict_yields(self, X_scaled):
+        """Predict yields for scaled feature rows"""
+        if self._onnx_session is not None:
+            X = np.ascontiguousarray(X_scaled, dtype=np.float32)
+            return self._onnx_session.run(None, {"X": X})[0].ravel().astype(np.float64)
+        
+        if self._inference_trees is None:
+            return self.model.predict(X_scaled)
+        
+        # Average the trees' predictions as RandomForestRegressor.predict does, but
+        # without re-validating the input or dispatching the trees through joblib;
+        # the trees compare features in float32, so rows are narrowed once up front
+        X = np.ascontiguousarray(X_scaled, dtype=np.float32)
+        if NUMBA_AVAILABLE:
+            roots, feature, threshold, left, right, value, _ = self._flat_forest
+            return _walk_forest(X.astype(np.float64), roots, feature, threshold, left, right, value)
+        if X.shape[0] <= FLAT_FOREST_MAX_ROWS:
+            return self._predict_flat(X)
+        
+        y_hat = np.zeros(X.shape[0], dtype=np.float64)
+        for tree in self._inference_trees:
+            y_hat += tree.predict(X, check_input=False)
+        y_hat /= len(self._inference_trees)
+        return y_hat
+    
     def get_feature_importance(self):
         """Get feature importance scores"""
         if not self.is_trained:
             raise ValueError("Model must be trained before getting feature importance")
         
-        importance_dict = dict(zip(self.feature_names, self.model.feature_importances_))
-        return dict(sorted(importance_dict.items(), key=lambda x: x[1], reverse=True))
+        # Importances are fixed once trained, so they are computed only once
+        if self._feature_importance is None:
+            importance_dict = dict(zip(self.feature_names, self.model.feature_importances_))
+            self._feature_importance = dict(sorted(importance_dict.items(), key=lambda x: x[1], reverse=True))
+        return dict(self._feature_importance)
     
     def get_county_features(self):
         """Get available counties for prediction"""
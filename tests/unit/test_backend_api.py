@@ -4,6 +4,7 @@ Unit tests for the FastAPI backend API
 
 import pytest
 import json
+import asyncio
 from datetime import datetime, timezone
 from unittest.mock import Mock, patch, MagicMock
 from fastapi.testclient import TestClient
@@ -15,6 +16,7 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent.parent
 sys.path.append(str(project_root))
 
+import src.api.fastapi_app as fastapi_app
 from src.api.fastapi_app import app
 from src.api.schemas import (
     PredictionRequest, 
@@ -205,6 +207,45 @@ class TestDatabaseModels:
         assert record.test_size == 0.2
         assert record.status == "running"
 
+class TestDatabaseConcurrency:
+    """Test concurrent access to the shared SQLite connection"""
+
+    def test_health_probe_during_prediction_writes(self, tmp_path):
+        """Test health probes running alongside the writer never disturb its transactions"""
+        import threading
+        from sqlalchemy import select, func
+        from src.api import database
+
+        engine, session_local, lock = database.ENGINE, database.SessionLocal, database._connection_lock
+        with patch.object(database, 'DATABASE_URL', f"sqlite:///{tmp_path / 'predictions.db'}"):
+            database.create_database_engine()
+
+        rows = [fastapi_app.prediction_row(800.0, 6.5, 2.1, "Nakuru", 75.5, 4.2, 0.01) for _ in range(20)]
+        probe_results = []
+
+        def write():
+            for _ in range(1000):
+                fastapi_app.store_predictions(rows)
+
+        def probe():
+            probe_results.extend(database.check_database_health() for _ in range(5000))
+
+        try:
+            threads = [threading.Thread(target=write)] + [threading.Thread(target=probe) for _ in range(2)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            with database.get_db_connection() as connection:
+                stored = connection.execute(select(func.count()).select_from(PredictionRecord)).scalar()
+        finally:
+            database.ENGINE.dispose()
+            database.ENGINE, database.SessionLocal, database._connection_lock = engine, session_local, lock
+
+        assert stored == 20 * 1000
+        assert all(probe_results)
+
 class TestMetricsCollector:
     """Test metrics collector"""
     
@@ -231,7 +272,25 @@ class TestMetricsCollector:
         assert collector.prediction_metrics.successful_requests == 1
         assert collector.prediction_metrics.average_processing_time == 0.15
         assert collector.feature_metrics.county_distribution["Unknown"] == 1
-    
+
+    def test_record_many(self):
+        """Test recording a batch of prediction metrics"""
+        collector = MetricsCollector()
+
+        collector.record_many([
+            (800.0, 6.5, 2.1, 75.5, 0.1, True),
+            (900.0, 7.0, 2.5, 0.0, 0.3, False)
+        ])
+
+        assert collector.prediction_metrics.total_requests == 2
+        assert collector.prediction_metrics.successful_requests == 1
+        assert collector.prediction_metrics.failed_requests == 1
+        assert collector.prediction_metrics.min_processing_time == 0.1
+        assert collector.prediction_metrics.max_processing_time == 0.3
+        assert collector.feature_metrics.rainfall_stats["mean"] == 850.0
+        assert collector.feature_metrics.county_distribution["Unknown"] == 2
+        assert collector.error_counts["/api/predict"] == 1
+
     def test_record_request(self):
         """Test recording request metrics"""
         collector = MetricsCollector()
@@ -287,6 +346,132 @@ class TestMetricsCollector:
         assert collector.prediction_metrics.total_requests == 0
         assert len(collector.response_times) == 0
 
+class TestMetricsBuffer:
+    """Test buffered prediction metrics"""
+
+    def test_flush_metrics_buffer(self):
+        """Test flushing drains every buffered event into the collector"""
+        collector = MetricsCollector()
+        with patch('src.api.fastapi_app.metrics_collector', collector):
+            fastapi_app._METRICS_BUFFER.extend(
+                (800.0, 6.5, 2.1, 75.5, 0.1, True) for _ in range(10000)
+            )
+            fastapi_app.flush_metrics_buffer()
+
+        assert collector.prediction_metrics.total_requests == 10000
+        assert len(fastapi_app._METRICS_BUFFER) == 0
+
+    def test_flush_metrics_periodically(self):
+        """Test the flush task records buffered events until cancelled"""
+        collector = MetricsCollector()
+
+        async def run_flusher():
+            task = asyncio.create_task(fastapi_app.flush_metrics_periodically())
+            fastapi_app._METRICS_BUFFER.append((800.0, 6.5, 2.1, 75.5, 0.1, True))
+            for _ in range(200):
+                await asyncio.sleep(0.01)
+                if collector.prediction_metrics.total_requests:
+                    break
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            return task
+
+        with patch('src.api.fastapi_app.metrics_collector', collector), \
+                patch('src.api.fastapi_app.METRICS_FLUSH_INTERVAL', 0.001):
+            task = asyncio.run(run_flusher())
+
+        assert collector.prediction_metrics.total_requests == 1
+        assert len(fastapi_app._METRICS_BUFFER) == 0
+        assert task.cancelled()
+
+class TestPredictionWriter:
+    """Test the queued prediction writer"""
+
+    @staticmethod
+    def make_rows(count, start=0):
+        return [
+            fastapi_app.prediction_row(800.0 + i, 6.5, 2.1, "Nakuru", 75.5, 4.2, 0.01)
+            for i in range(start, start + count)
+        ]
+
+    def test_writer_batches_queued_rows(self):
+        """Test rows queued together are stored with a single bulk insert"""
+        rows = self.make_rows(3)
+
+        async def run_writer():
+            queue = asyncio.Queue()
+            for row in rows:
+                queue.put_nowait(row)
+            task = asyncio.create_task(fastapi_app.write_predictions_periodically(queue))
+            for _ in range(200):
+                await asyncio.sleep(0.01)
+                if mock_store.called:
+                    break
+            await fastapi_app.cancel_and_wait(task)
+
+        with patch('src.api.fastapi_app.store_predictions') as mock_store:
+            asyncio.run(run_writer())
+
+        mock_store.assert_called_once_with(rows)
+
+    def test_queue_full_drops_rows(self):
+        """Test rows beyond the queue's capacity are dropped rather than blocking"""
+        queue = asyncio.Queue(maxsize=2)
+        background_tasks = Mock()
+
+        with patch('src.api.fastapi_app.prediction_write_queue', queue):
+            fastapi_app.queue_predictions(self.make_rows(3), background_tasks)
+
+        assert queue.qsize() == 2
+        background_tasks.add_task.assert_not_called()
+
+    def test_without_writer_uses_background_task(self):
+        """Test rows are stored in a background task when no writer is running"""
+        rows = self.make_rows(2)
+        background_tasks = Mock()
+
+        with patch('src.api.fastapi_app.prediction_write_queue', None):
+            fastapi_app.queue_predictions(rows, background_tasks)
+
+        background_tasks.add_task.assert_called_once_with(fastapi_app.store_predictions, rows)
+
+    def test_shutdown_stores_every_row_once_with_one_writer(self):
+        """Test stopping the writer and draining its queue never overlaps two writers"""
+        import threading
+        import time
+
+        stored = []
+        active = []
+        overlaps = []
+        lock = threading.Lock()
+
+        def slow_store(rows):
+            with lock:
+                active.append(1)
+                overlaps.append(len(active) > 1)
+            time.sleep(0.05)
+            with lock:
+                active.pop()
+            stored.extend(rows)
+
+        async def run_and_shut_down():
+            queue = asyncio.Queue()
+            task = asyncio.create_task(fastapi_app.write_predictions_periodically(queue))
+            for row in self.make_rows(3):
+                queue.put_nowait(row)
+            # Let the writer start storing the first batch, then queue more behind it
+            await asyncio.sleep(0.03)
+            for row in self.make_rows(2, start=3):
+                queue.put_nowait(row)
+            await fastapi_app.cancel_and_wait(task)
+            fastapi_app.drain_prediction_queue(queue)
+
+        with patch('src.api.fastapi_app.store_predictions', side_effect=slow_store):
+            asyncio.run(run_and_shut_down())
+
+        assert sorted(row["rainfall"] for row in stored) == [800.0 + i for i in range(5)]
+        assert not any(overlaps)
+
 class TestAPIEndpoints:
     """Test API endpoints"""
     
@@ -325,6 +510,13 @@ class TestAPIEndpoints:
         assert "count" in data
         assert len(data["counties"]) > 0
         assert "Nakuru" in data["counties"]
+
+    def test_get_counties_timestamp_per_request(self):
+        """Test the counties payload is stamped with each response's time"""
+        for now in (datetime(2024, 1, 1, tzinfo=timezone.utc), datetime(2024, 1, 2, tzinfo=timezone.utc)):
+            with patch('src.api.fastapi_app.utc_now', return_value=now):
+                response = client.get("/api/counties")
+            assert response.json()["timestamp"] == now.replace(tzinfo=None).isoformat() + "Z"
     
     @patch('src.api.fastapi_app.model')
     @patch('src.api.fastapi_app.metrics_collector')
@@ -545,6 +737,39 @@ class TestBatchPrediction:
         assert len(failed_results) == 1
         assert failed_results[0]["error"] == "Invalid parameters"
 
+    @patch('src.api.fastapi_app.NDJSON_CHUNK_LINES', 1)
+    @patch('src.api.fastapi_app.model')
+    def test_batch_prediction_stream(self, mock_model):
+        """Test streamed batch prediction yields one JSON result per line, across chunks"""
+        mock_model.is_trained = True
+        # Fail the vectorized call so items are predicted individually
+        mock_model.predict_resilience_scores_batch.side_effect = ValueError("Batch failed")
+        mock_model.predict_resilience_score.side_effect = [
+            {"resilience_score": 75.5, "predicted_yield": 4.2},  # First prediction succeeds
+            ValueError("Invalid parameters")  # Second prediction fails
+        ]
+
+        batch_request = {
+            "predictions": [
+                SAMPLE_PREDICTION_REQUEST,
+                {
+                    "rainfall": 900.0,
+                    "soil_ph": 7.0,
+                    "organic_carbon": 2.5,
+                    "county": "Nairobi"
+                }
+            ]
+        }
+
+        response = client.post("/api/predict/batch/stream", json=batch_request)
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+
+        results = [json.loads(line) for line in response.text.splitlines()]
+        assert [r["status"] for r in results] == ["success", "error"]
+        assert results[0]["prediction"]["resilience_score"] == 75.5
+        assert results[1]["error"] == "Invalid parameters"
+
 class TestErrorHandling:
     """Test error handling"""
     
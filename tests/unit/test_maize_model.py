@@ -3,8 +3,10 @@ Unit tests for MaizeResilienceModel
 """
 
 import unittest
+import importlib.util
 import numpy as np
 import polars as pl
+import pandas as pd
 from unittest.mock import patch, MagicMock
 import sys
 from pathlib import Path
@@ -13,7 +15,7 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent.parent
 sys.path.append(str(project_root))
 
-from src.models.maize_resilience_model import MaizeResilienceModel
+from src.models.maize_resilience_model import MaizeResilienceModel, _walk_forest
 from config.settings import BENCHMARK_YIELD
 
 class TestMaizeResilienceModel(unittest.TestCase):
@@ -195,5 +197,170 @@ class TestMaizeResilienceModel(unittest.TestCase):
         with self.assertRaises(Exception):
             self.model.predict_resilience_score(800, 6.5, 15.0)
 
+    def _train_county_model(self, seed=42):
+        """Train the model on synthetic county rows, without county statistics"""
+        rng = np.random.default_rng(seed)
+        county_data = pl.DataFrame({
+            'County': ['Nakuru', 'Kisumu', 'Meru'] * 10,
+            'Annual_Rainfall_mm': rng.uniform(300, 1800, 30),
+            'Soil_pH': rng.uniform(5.0, 7.5, 30),
+            'Soil_Organic_Carbon': rng.uniform(0.5, 4.0, 30),
+            'Maize_Yield_tonnes_ha': rng.uniform(1.0, 5.0, 30)
+        })
+        X, y = self.model.prepare_features(county_data)
+        self.model.train(X, y)
+        self.model.county_data = pd.DataFrame()  # No county statistics: use defaults
+        return X, y
+
+    def test_batch_prediction_matches_single(self):
+        """Test batch predictions match one-at-a-time predictions"""
+        self._train_county_model()
+
+        inputs = [(800, 6.5, 2.1, 'Nakuru'), (400, 5.0, 0.8, 'Meru'), (1500, 7.5, 4.0, 'Unknown')]
+        batch = self.model.predict_resilience_scores_batch(*zip(*inputs))
+        single = [self.model.predict_resilience_score(*args) for args in inputs]
+
+        self.assertEqual(batch['resilience_scores'], [r['resilience_score'] for r in single])
+        self.assertEqual(batch['predicted_yields'], [r['predicted_yield'] for r in single])
+        self.assertEqual(batch['feature_importance'], single[0]['feature_importance'])
+
+    def test_training_reports_oob_score(self):
+        """Test training reports the out-of-bag R², cross-validating only on request"""
+        X, y = self._train_county_model(seed=3)
+
+        results = self.model.train(X, y)
+        self.assertEqual(results['oob_r2'], self.model.model.oob_score_)
+        self.assertIsNone(results['cv_r2_mean'])
+        self.assertIsNone(results['cv_r2_std'])
+        self.assertNotIn('oob_score', self.model.model_params)
+
+        results = self.model.train(X, y, cross_validate=True)
+        self.assertIsNotNone(results['oob_r2'])
+        self.assertIsNotNone(results['cv_r2_mean'])
+        self.assertGreaterEqual(results['cv_r2_std'], 0)
+
+    def test_prediction_cache_hit(self):
+        """Test a repeated prediction is served from the cache as an independent copy"""
+        self._train_county_model()
+
+        with patch.object(self.model, '_predict_yields', wraps=self.model._predict_yields) as mock_predict:
+            first = self.model.predict_resilience_score(800, 6.5, 2.1, 'Nakuru')
+            second = self.model.predict_resilience_score(800, 6.5, 2.1, 'Nakuru')
+
+        self.assertEqual(mock_predict.call_count, 1)
+        self.assertEqual(first, second)
+        self.assertEqual(self.model.prediction_cache_info()['hits'], 1)
+
+        # Mutating one caller's result leaves the cached entry untouched
+        first['feature_importance'].clear()
+        self.assertEqual(self.model.predict_resilience_score(800, 6.5, 2.1, 'Nakuru'), second)
+
+    def test_prediction_cache_cleared_on_county_data_load(self):
+        """Test loading county data invalidates cached predictions"""
+        import tempfile
+        import os
+
+        self._train_county_model()
+        self.model.predict_resilience_score(800, 6.5, 2.1, 'Nakuru')
+        self.assertEqual(self.model.prediction_cache_info()['currsize'], 1)
+
+        county_rows = pd.DataFrame({
+            'County': ['Nakuru', 'Nakuru', 'Meru', 'Meru'],
+            'Monthly_Temperature_C': [20.0, 22.0, 18.0, 19.0],
+            'Monthly_Humidity_Percent': [60.0, 65.0, 70.0, 72.0],
+            'Soil_Clay': [30.0, 30.0, 25.0, 25.0],
+            'Soil_pH_H2O': [6.5, 6.5, 5.8, 5.8],
+            'Soil_Organic_Carbon': [2.0, 2.0, 1.5, 1.5],
+            'Monthly_Precipitation_mm': [80.0, 100.0, 120.0, 90.0],
+            'Maize_Yield_tonnes_ha': [3.5, 3.5, 2.8, 2.8]
+        })
+        with tempfile.NamedTemporaryFile(delete=False, suffix='.csv') as tmp_file:
+            tmp_path = tmp_file.name
+
+        try:
+            county_rows.to_csv(tmp_path, index=False)
+            self.assertTrue(self.model.load_county_data(tmp_path))
+        finally:
+            os.unlink(tmp_path)
+
+        self.assertEqual(self.model.prediction_cache_info()['currsize'], 0)
+        with patch.object(self.model, '_predict_yields', wraps=self.model._predict_yields) as mock_predict:
+            self.model.predict_resilience_score(800, 6.5, 2.1, 'Nakuru')
+        self.assertEqual(mock_predict.call_count, 1)
+
+    def test_inference_matches_forest_predict(self):
+        """Test direct tree evaluation matches RandomForestRegressor.predict exactly"""
+        X, y = self._train_county_model(seed=7)
+        rng = np.random.default_rng(7)
+
+        # Small batches walk the flattened forest, large ones go tree by tree
+        for n_rows in (1, 200):
+            X_scaled = rng.normal(size=(n_rows, X.shape[1]))
+            np.testing.assert_array_equal(
+                self.model._predict_yields(X_scaled.copy()),
+                self.model.model.predict(X_scaled)
+            )
+
+    def test_walk_forest_matches_forest_predict(self):
+        """Test the forest walk (compiled when Numba is available) matches RandomForestRegressor.predict exactly"""
+        X, y = self._train_county_model(seed=11)
+        rng = np.random.default_rng(11)
+
+        roots, feature, threshold, left, right, value, _ = self.model._flat_forest
+        X_scaled = rng.normal(size=(50, X.shape[1]))
+        # Rows are narrowed to float32 as the trees see them, then walked in float64
+        X_walk = X_scaled.astype(np.float32).astype(np.float64)
+        np.testing.assert_array_equal(
+            _walk_forest(X_walk, roots, feature, threshold, left, right, value),
+            self.model.model.predict(X_scaled)
+        )
+
+    @unittest.skipUnless(importlib.util.find_spec('numba'), "numba is required for the compiled forest walk")
+    def test_compiled_walk_serves_predictions(self):
+        """Test predictions go through the Numba-compiled walk and match RandomForestRegressor.predict exactly"""
+        self._train_county_model()
+
+        self.assertTrue(hasattr(_walk_forest, 'py_func'))  # Numba dispatcher, not the plain function
+        rng = np.random.default_rng(13)
+        for n_rows in (1, 200):
+            X_scaled = rng.normal(size=(n_rows, self.model.model.n_features_in_))
+            with patch.object(self.model, '_predict_flat') as mock_flat:
+                y_hat = self.model._predict_yields(X_scaled.copy())
+            mock_flat.assert_not_called()
+            np.testing.assert_array_equal(y_hat, self.model.model.predict(X_scaled))
+
+    @unittest.skipUnless(
+        importlib.util.find_spec('skl2onnx') and importlib.util.find_spec('onnxruntime'),
+        "skl2onnx and onnxruntime are required for ONNX export"
+    )
+    def test_onnx_export_served_only_for_its_forest(self):
+        """Test an ONNX export is served after loading its forest and ignored after a retrain"""
+        import tempfile
+        import os
+
+        self._train_county_model()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            model_path = os.path.join(tmp_dir, 'model.joblib')
+            self.model.save_model(model_path)
+            self.assertIsNotNone(self.model.export_onnx(model_path))
+
+            exported = MaizeResilienceModel()
+            exported.load_model(model_path)
+            self.assertIsNotNone(exported._onnx_session)
+            X_scaled = np.random.default_rng(5).normal(size=(20, self.model.model.n_features_in_))
+            np.testing.assert_allclose(
+                exported._predict_yields(X_scaled.copy()),
+                self.model.model.predict(X_scaled),
+                rtol=1e-4
+            )
+
+            # Retraining and saving over the dump leaves the old export behind
+            self.model.model.set_params(random_state=7)
+            self._train_county_model()
+            self.model.save_model(model_path)
+            retrained = MaizeResilienceModel()
+            retrained.load_model(model_path)
+            self.assertIsNone(retrained._onnx_session)
+
 if __name__ == '__main__':
     unittest.main()